@@ -74,6 +74,7 @@ def get_app_data_path(filename=""):
 # ⚠️ MODIFICA: Ora anche le risorse grafiche puntano ad APPDATA
 # ==========================================================================
 ICON_PATH = get_resource_path("gui/icon.ico")
+DARK_QSS_PATH = get_resource_path("gui/dark.qss")
 BACKGROUND_PATH = get_resource_path("gui/background.png")
 RARITY_ICONS_DIR = get_resource_path("gui/")
 # ==========================================================================
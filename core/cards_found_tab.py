@@ -18,12 +18,12 @@ import sqlite3
 import json
 import csv
 import base64
-import urllib.request
 from typing import TYPE_CHECKING
 
 # Import moduli app
 from config import DB_FILENAME, RARITY_DATA, get_app_data_path, get_resource_path
 from .translations import t
+from .utils import get_http_session
 
 # Import classi helper per il download (copiate da collection_tab)
 class ImageLoaderSignals(QObject):
@@ -36,9 +36,6 @@ class ImageDownloaderWorker(QRunnable):
         self.image_url = image_url
         self.target_label = target_label
         self.signals = ImageLoaderSignals()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
 
     @pyqtSlot()
     def run(self):
@@ -46,9 +43,10 @@ class ImageDownloaderWorker(QRunnable):
             self.signals.error.emit("URL non valido", self.image_url, self.target_label)
             return
         try:
-            req = urllib.request.Request(self.image_url, headers=self.headers)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                image_data = response.read()
+            # Sessione del thread: connessioni TCP/TLS riusate tra i download
+            response = get_http_session().get(self.image_url, timeout=10)
+            response.raise_for_status()
+            image_data = response.content
             if image_data:
                 self.signals.finished.emit(image_data, self.image_url, self.target_label)
             else:
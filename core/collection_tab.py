@@ -6,10 +6,10 @@ inclusa la logica di caricamento, i filtri e la visualizzazione della griglia.
 
 # Import PyQt5
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
+    QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QScrollArea, QFrame,
     QComboBox, QLineEdit, QToolButton, QSizePolicy, 
-    QGraphicsOpacityEffect, QApplication
+    QApplication
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QSize, QThreadPool, QRunnable, QObject, pyqtSlot, QUrl
 from PyQt5.QtGui import QPixmap, QFont
@@ -17,12 +17,12 @@ from PyQt5.QtGui import QPixmap, QFont
 # Import standard
 import os
 import sqlite3
-import urllib.request
 from typing import TYPE_CHECKING
 
 # Import moduli app
-from config import DB_FILENAME, RARITY_DATA, get_app_data_path, get_resource_path
+from config import DB_FILENAME, RARITY_DATA, get_app_data_path
 from .translations import t
+from .utils import get_http_session
 from .database import DatabaseManager
 from .wishlist_manager import WishlistManager
 
@@ -31,7 +31,7 @@ from .wishlist_manager import WishlistManager
 if TYPE_CHECKING:
     from .ui_main_window import MainWindow
 
-from .ui_widgets import CollectionCardDialog
+from .ui_widgets import CollectionCardDialog, CardListModel, CardListView
 
 # ================================================================
 # 1. CLASSI HELPER PER IL DOWNLOAD ASINCRONO
@@ -48,9 +48,6 @@ class ImageDownloaderWorker(QRunnable):
         self.image_url = image_url
         self.target_label = target_label
         self.signals = ImageLoaderSignals()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
 
     @pyqtSlot()
     def run(self):
@@ -59,9 +56,10 @@ class ImageDownloaderWorker(QRunnable):
             return
             
         try:
-            req = urllib.request.Request(self.image_url, headers=self.headers)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                image_data = response.read()
+            # Sessione del thread: connessioni TCP/TLS riusate tra i download
+            response = get_http_session().get(self.image_url, timeout=10)
+            response.raise_for_status()
+            image_data = response.content
                 
             if image_data:
                 self.signals.finished.emit(image_data, self.image_url, self.target_label)
@@ -98,6 +96,7 @@ class CollectionTab(QWidget):
         self.collection_card_widgets = {} # Cache per i filtri
         self.inventory_map = {}           # Cache dell'inventario corrente
         self.wishlist_map = {}            # DEPRECATO (ora in wishlist_manager)
+        self._card_placeholder_pixmap = None  # Vedi _card_placeholder
         self.collection_loaded = False    # Flag per il primo caricamento
         
         # 5. Avvia la costruzione dell'interfaccia
@@ -192,54 +191,8 @@ class CollectionTab(QWidget):
     # LOGICA DI CARICAMENTO COLLEZIONE (Spostata da MainWindow)
     # ----------------------------------------------------------------
 
-    def _handle_card_click(self, event, clicked_widget, card_id: int):
-        """
-        Gestisce il click sulla carta. Ignora se il click è
-        sul bottone wishlist (già gestito).
-        """
-        # Trova il bottone wishlist all'interno del widget
-        wishlist_btn = clicked_widget.findChild(QPushButton) 
-        
-        if wishlist_btn:
-            # Controlla se il click è avvenuto DENTRO i bordi del bottone
-            if wishlist_btn.geometry().contains(event.pos()):
-                # Se sì, è un click sulla wishlist, ignora l'apertura del dialog
-                event.accept() # Segna l'evento come gestito
-                return
-
-        # ✅ CORREZIONE: Passa 'clicked_widget' alla funzione successiva
-        self.open_card_details(event, card_id, clicked_widget)
-
-
-    def open_card_details(self, event, card_id: int, clicked_widget):
-        """
-        Apre il dialog dei dettagli, ma ignora se il click
-        è sul bottone wishlist.
-        """
-        # Ignora se non è il tasto sinistro
-        if event.button() != Qt.LeftButton:
-            return
-
-        # Cerca il bottone wishlist
-        wishlist_btn = clicked_widget.findChild(QPushButton)
-        
-        if wishlist_btn:
-            # ================================================================
-            # ✅ FIX: Mappa le coordinate del click
-            # ================================================================
-            
-            # Mappa il punto del click (relativo a card_widget)
-            # alle coordinate relative al bottone
-            pos_in_button = wishlist_btn.mapFrom(clicked_widget, event.pos())
-            
-            # Controlla se il click è dentro il rettangolo del bottone
-            if wishlist_btn.rect().contains(pos_in_button):
-                # Se sì, il click era sul bottone. Ignora l'apertura del dialog
-                # (il segnale clicked.connect del bottone farà il resto)
-                return
-            # ================================================================
-
-        # Se non era sul bottone, apri il dialog
+    def open_card_details(self, card_id: int):
+        """Apre il dialog dei dettagli della carta cliccata nella griglia."""
         try:
             dialog = CollectionCardDialog(card_id, self.db_manager, self)
             dialog.exec_()
@@ -613,66 +566,43 @@ class CollectionTab(QWidget):
             total_cards = len(cards)
             print(f"📊 Trovate {total_cards} carte in {set_code}")
 
-            # Layout e ScrollArea
+            # Layout
             existing_layout = cards_container.layout()
             if existing_layout is None: # Fallback di sicurezza
                 existing_layout = QVBoxLayout(cards_container)
                 cards_container.setLayout(existing_layout)
             
-            scroll = QScrollArea()
-            scroll.setWidgetResizable(True)
-            scroll.setStyleSheet("QScrollArea { border: none; }")
-            
-            grid_widget = QWidget()
-            grid_layout = QGridLayout(grid_widget)
-            grid_layout.setSpacing(10)
-            
-            # Salva la griglia per i filtri
+            # Carte del set in wishlist: un solo controllo per tutto il set
+            wished_ids = self.wishlist_manager.wished_among(card_row[0] for card_row in cards)
+            
+            # Righe del modello e metadati per i filtri (stesso indice di riga)
+            card_rows = []
+            filter_rows = []
+            for card_id, card_name, rarity, image_blob, card_number in cards:
+                # Usa la mappa dell'inventario (già caricata)
+                quantity = self.inventory_map.get(card_id, 0)
+                card_rows.append((
+                    card_id, card_name, rarity, card_number, image_blob, quantity,
+                    card_id in wished_ids
+                ))
+                filter_rows.append((card_name, rarity, quantity, card_number))
+            
+            # Un solo QListView per set: le carte sono disegnate dal delegate e
+            # le miniature decodificate solo quando entrano nel viewport
+            cards_model = CardListModel(card_rows, self.image_cache, self._card_placeholder())
+            cards_model.wishlist_changed.connect(self._handle_wishlist_toggle)
+            cards_view = CardListView(cards_model)
+            cards_model.setParent(cards_view)
+            cards_view.setStyleSheet("QListView { border: none; }")
+            cards_view.card_clicked.connect(self.open_card_details)
+            
+            # Salva la vista per i filtri (setRowHidden)
             self.collection_card_widgets[set_code] = {
-                'widgets': [],
-                'layout': grid_layout
+                'cards': filter_rows,
+                'view': cards_view
             }
             
-            # Carica in batch
-            batch_size = 50
-            card_index = 0
-            
-            for batch_num in range(0, total_cards, batch_size):
-                batch_cards = cards[batch_num:batch_num + batch_size]
-                
-                for idx, card_row in enumerate(batch_cards):
-                    card_id = card_row[0]
-                    card_name = card_row[1]
-                    rarity = card_row[2]
-                    image_blob = card_row[3]
-                    card_number = card_row[4] 
-                    
-                    # Usa la mappa dell'inventario (già caricata)
-                    quantity = self.inventory_map.get(card_id, 0)
-                    
-                    card_widget = self.create_card_widget(
-                        card_id, card_name, rarity, card_number, image_blob, quantity
-                    )
-                    
-                    # Salva il widget e i metadati per il filtro
-                    self.collection_card_widgets[set_code]['widgets'].append((
-                        card_widget, card_name, rarity, quantity, card_number
-                    ))
-                    
-                    row = card_index // 5
-                    col = card_index % 5
-                    card_index += 1
-                    grid_layout.addWidget(card_widget, row, col)
-                
-                QApplication.processEvents()
-                progress = int((batch_num + len(batch_cards)) / total_cards * 100)
-                self.collection_stats_label.setText(
-                    f"⏳ Loading {set_name}... {progress}%"
-                )
-                self.collection_stats_label.repaint()
-            
-            scroll.setWidget(grid_widget)
-            existing_layout.addWidget(scroll)
+            existing_layout.addWidget(cards_view)
             
             print(f"✅ {set_code} completato")
             self.collection_stats_label.setText(f"✅ Ready!")
@@ -682,151 +612,25 @@ class CollectionTab(QWidget):
             import traceback
             traceback.print_exc()
 
-    def create_card_widget(self, card_id: int, card_name, rarity, card_number, image_blob, total_quantity: int) -> QWidget:
-        """Crea il widget per una singola carta."""
-        
-        is_wished = self.wishlist_manager.is_wished(card_id)
-        
-        card_widget = QFrame()
-        card_widget.setFixedSize(120, 210) 
-        # ✅ FIX 1: Rimuovi qualsiasi stile predefinito di bordo/sfondo dal QFrame principale.
-        # Se c'era uno stylesheet qui prima, dovrebbe essere rimosso.
-        # Ad esempio: card_widget.setStyleSheet("border: 1px solid gray; border-radius: 5px; background-color: #333;")
-        # Lasciare vuoto o impostare uno stile minimalista per il background se necessario.
-        card_widget.setStyleSheet("background-color: #333;") # Un colore di sfondo base se non ne vuoi uno trasparente
-
-        main_v_layout = QVBoxLayout(card_widget)
-        main_v_layout.setContentsMargins(0, 0, 0, 0)
-        main_v_layout.setSpacing(2) 
-
-        image_container = QWidget()
-        image_container.setFixedSize(120, 160) 
-        card_layout = QGridLayout(image_container)
-        card_layout.setContentsMargins(0, 0, 0, 0)
-        card_layout.setSpacing(0)
-        
-        image_label = QLabel()
-        image_label.setScaledContents(True)
-        pixmap = QPixmap()
-        if image_blob:
-            pixmap.loadFromData(image_blob)
-            if not pixmap.isNull(): 
-                pixmap = pixmap.scaled(120, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.image_cache.put(card_id, pixmap)
-                image_label.setPixmap(pixmap)
-            else:
-                image_label.setPixmap(self.placeholder_pixmap.scaled(120, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            image_label.setPixmap(self.placeholder_pixmap.scaled(120, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        card_layout.addWidget(image_label, 0, 0) 
-        
-        quantity_label = QLabel(f"x{total_quantity}")
-        quantity_label.setAlignment(Qt.AlignCenter)
-        quantity_label.setStyleSheet("""
-            background-color: #000000; color: white; padding: 2px 5px;
-            margin: 5px; border-radius: 5px; font-weight: bold;
-        """)
-        card_layout.addWidget(quantity_label, 0, 0, Qt.AlignRight | Qt.AlignBottom)
-
-        wishlist_btn = QPushButton()
-        wishlist_btn.setFixedSize(28, 28) 
-        self.update_wishlist_button_style(wishlist_btn, is_wished)
-        wishlist_btn.clicked.connect(lambda: self._handle_wishlist_toggle(card_id, wishlist_btn))
-        card_layout.addWidget(wishlist_btn, 0, 0, Qt.AlignLeft | Qt.AlignTop)
-        
-        if total_quantity == 0:
-            opacity_effect = QGraphicsOpacityEffect(image_container)
-            opacity_effect.setOpacity(0.4) 
-            image_container.setGraphicsEffect(opacity_effect)
-            quantity_label.hide()
-        
-        main_v_layout.addWidget(image_container)
-
-        # ✅ FIX 2: Rimuovi stili di bordo/sfondo dai QLabel di nome e rarità
-        
-        # Nome
-        name_label = QLabel(f"#{card_number} {card_name}")
-        name_label.setStyleSheet("font-size: 9px; font-weight: bold; color: white; background-color: transparent;") # Rimuovi background-color
-        name_label.setWordWrap(True)
-        name_label.setAlignment(Qt.AlignCenter)
-        main_v_layout.addWidget(name_label)
-        
-        # Linea Separatore
-        separator = QFrame()
-        separator.setFrameShape(QFrame.HLine) 
-        separator.setFrameShadow(QFrame.Sunken)
-        separator.setStyleSheet("background-color: #555; max-height: 1px; margin-top: 2px; margin-bottom: 2px;")
-        main_v_layout.addWidget(separator)
-        
-        # Icona Rarità
-        rarity_icon_label = QLabel()
-        rarity_icon_label.setStyleSheet("color: white; background-color: transparent;") # Rimuovi background-color
-        
-        if rarity in RARITY_DATA:
-            icon_full_path = get_resource_path(RARITY_DATA[rarity])
-            if os.path.exists(icon_full_path):
-                rarity_pixmap = QPixmap(icon_full_path)
-                scaled_pixmap = rarity_pixmap.scaledToHeight(20, Qt.SmoothTransformation)
-                rarity_icon_label.setFixedHeight(20)                    
-                rarity_icon_label.setPixmap(scaled_pixmap)
-                rarity_icon_label.setAlignment(Qt.AlignCenter)
-                rarity_icon_label.setToolTip(rarity)
-            else:
-                rarity_icon_label.setText(rarity) 
-        else:
-            rarity_icon_label.setText(rarity) 
+    def _card_placeholder(self) -> QPixmap:
+        """Placeholder 120x160 delle carte senza immagine (scalato una sola volta)."""
+        if self._card_placeholder_pixmap is None:
+            self._card_placeholder_pixmap = self.placeholder_pixmap.scaled(
+                120, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+        return self._card_placeholder_pixmap
 
-        main_v_layout.addWidget(rarity_icon_label) 
-        
-        main_v_layout.addStretch(1) 
-        
-        card_widget.mousePressEvent = lambda event, c_id=card_id, widget=card_widget: self._handle_card_click(event, widget, c_id)
-        card_widget.setCursor(Qt.PointingHandCursor)
-        
-        return card_widget
     # ----------------------------------------------------------------
     # LOGICA WISHLIST (Spostata da MainWindow)
     # ----------------------------------------------------------------
 
-    def _handle_wishlist_toggle(self, card_id: int, wishlist_btn: QPushButton):
+    def _handle_wishlist_toggle(self, card_id: int, is_wishlisted: bool):
         """
-        Handler UI per il click sulla wishlist.
-        Chiama il manager e poi aggiorna lo stile.
+        Handler UI per il click sul cuoricino (disegnato da CardDelegate).
+        Allinea il manager al nuovo stato mostrato dalla griglia.
         """
-        # 1. Chiama il manager per fare la modifica
-        new_state = self.wishlist_manager.toggle_wishlist(card_id)
-        
-        # 2. Aggiorna lo stile del bottone
-        self.update_wishlist_button_style(wishlist_btn, new_state)
-
-    def update_wishlist_button_style(self, wishlist_btn: QPushButton, is_wishlisted: bool):
-        """Aggiorna lo stile del pulsante wishlist."""
-        if is_wishlisted:
-            wishlist_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(231, 76, 60, 200);
-                    border: 2px solid #c0392b;
-                    border-radius: 14px;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(231, 76, 60, 255);
-                }
-            """)
-            wishlist_btn.setText("❤️")
-        else:
-            wishlist_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(0, 0, 0, 150);
-                    border: 2px solid #555;
-                    border-radius: 14px;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(231, 76, 60, 150);
-                }
-            """)
-            wishlist_btn.setText("🤍")
+        if self.wishlist_manager.is_wished(card_id) != is_wishlisted:
+            self.wishlist_manager.toggle_wishlist(card_id)
 
     # ----------------------------------------------------------------
     # ALTRE FUNZIONI HELPER (Spostate da MainWindow)
@@ -869,9 +673,9 @@ class CollectionTab(QWidget):
         rarity_filter = self.collection_rarity_filter.currentData()
         
         for set_code, set_data in self.collection_card_widgets.items():
-            widgets = set_data.get('widgets', [])
+            view = set_data['view']
             
-            for widget, card_name, rarity, quantity, card_number in widgets:
+            for row, (card_name, rarity, quantity, card_number) in enumerate(set_data['cards']):
                 show = True
                 
                 # Filtro ricerca
@@ -890,7 +694,9 @@ class CollectionTab(QWidget):
                     if rarity != rarity_filter:
                         show = False
                 
-                widget.setVisible(show)
+                # Solo un flag per riga: il layout della vista è ricalcolato
+                # una volta sola, in differita, dopo tutto il ciclo
+                view.setRowHidden(row, not show)
 
     def load_card_image_async(self, image_url: str, target_label: QLabel, scale_w: int, scale_h: int):
         """Carica un'immagine asincrona."""
@@ -4,12 +4,40 @@
 """database.py - Gestione database SQLite e validazione"""
 import sqlite3
 import os
+import io
 from datetime import datetime
+from operator import itemgetter
 from threading import Lock
+from typing import Callable, Optional
 
 from config import DB_FILENAME, TABLES_SCHEMA, get_app_data_path
 
 
+# Scritture inventario in blocco (set_inventory_quantities)
+_Q_DELETE_INVENTORY = """
+    DELETE FROM account_inventory
+    WHERE account_id = ? AND card_id = ?
+"""
+_Q_UPSERT_INVENTORY = """
+    INSERT INTO account_inventory (account_id, card_id, quantity)
+    VALUES (?, ?, ?)
+    ON CONFLICT(account_id, card_id) 
+    DO UPDATE SET quantity = excluded.quantity
+"""
+
+# Scritture wishlist in blocco (set_wishlist_states)
+_Q_INSERT_WISHLIST = "INSERT OR IGNORE INTO wishlist (card_id) VALUES (?)"
+_Q_DELETE_WISHLIST = "DELETE FROM wishlist WHERE card_id = ?"
+
+# Miniature delle carte: stessa dimensione/qualità usate dallo scraper
+# all'importazione (_prepare_card_data_for_db). Un JPEG 250x350 pesa poche
+# decine di KB: solo i BLOB più grandi vengono decodificati dalla migrazione
+_THUMB_MAX_SIZE = (250, 350)
+_THUMB_JPEG_QUALITY = 85
+_THUMB_MAX_BYTES = 64 * 1024
+_THUMB_COMMIT_EVERY = 50  # Commit a blocchi: la UI può scrivere tra un blocco e l'altro
+# PRAGMA user_version dopo la migrazione delle miniature (eseguita una sola volta)
+_THUMB_SHRUNK_VERSION = 1
 
 
 # ============================================================================
@@ -309,55 +337,37 @@ class DatabaseManager:
             """
             try:
                 self.cursor.execute("SELECT card_id FROM wishlist")
-                # Usa una set comprehension per efficienza
-                return {row[0] for row in self.cursor.fetchall()}
+                # Un solo set() su map(itemgetter): il ciclo gira tutto in C
+                return set(map(itemgetter(0), self.cursor.fetchall()))
             except Exception as e:
                 self.log_callback(f"❌ Errore get_wishlist: {e}")
                 return set()
 
-# database.py (Aggiungi questo metodo alla tua classe DatabaseManager)
-
-    def toggle_wishlist_status(self, card_id: int) -> bool:
+    def set_wishlist_states(self, states: dict) -> bool:
         """
-        Aggiunge o rimuove una carta dalla wishlist universale. 
-        Restituisce True se la carta è ora nella wishlist, False altrimenti.
+        Applica in un'unica transazione più modifiche alla wishlist
+        ({card_id: True se in wishlist, False altrimenti}).
         """
-        if card_id is None:
-            return False
-
-        card_id = int(card_id)
-
+        if not states:
+            return True
+        
+        to_insert = [(card_id,) for card_id, wished in states.items() if wished]
+        to_delete = [(card_id,) for card_id, wished in states.items() if not wished]
+        
         try:
-            # 1. Controlla se la carta è già nella wishlist
-            self.cursor.execute(
-                "SELECT id FROM wishlist WHERE card_id = ?", 
-                (card_id,)
-            )
-            exists = self.cursor.fetchone()
+            if to_delete:
+                self.cursor.executemany(_Q_DELETE_WISHLIST, to_delete)
+            if to_insert:
+                self.cursor.executemany(_Q_INSERT_WISHLIST, to_insert)
+            
+            # Un solo commit per tutti i toggle accumulati
+            self.conn.commit()
+            return True
             
-            if exists:
-                # 2. Se esiste, rimuovi (TOGGLE OFF)
-                self.cursor.execute(
-                    "DELETE FROM wishlist WHERE card_id = ?", 
-                    (card_id,)
-                )
-                self.conn.commit()
-                return False
-            else:
-                # 3. Se non esiste, aggiungi (TOGGLE ON)
-                self.cursor.execute(
-                    "INSERT INTO wishlist (card_id) VALUES (?)", 
-                    (card_id,) 
-                )
-                self.conn.commit()
-                return True
-                
         except Exception as e:
-            self.log_callback(f"Errore toggle wishlist: {e}") 
+            self.log_callback(f"❌ Errore set_wishlist_states: {e}")
             self.conn.rollback()
-            # Se 'exists' è None, c'era un errore, ma lo stato non è cambiato
-            # Se 'exists' non è None, c'era un errore, ma lo stato non è cambiato
-            return exists is not None # Ritorna lo stato pre-operazione in caso di errore
+            return False
 
     def connect(self):
         """
@@ -381,38 +391,34 @@ class DatabaseManager:
             self.log_callback(f"❌ Errore connessione DB: {e}")
             return False
 
-    def set_inventory_quantity(self, account_id: int, card_id: int, new_quantity: int) -> bool:
-            """
-            Imposta la quantità esatta di una carta per un account.
-            Se la quantità è <= 0, la voce viene eliminata.
-            Altrimenti, esegue un UPSERT (Insert/Update).
-            """
-            if account_id is None or card_id is None:
-                return False
-                
-            try:
-                if new_quantity <= 0:
-                    # Quantità 0 o negativa: Rimuovi la voce
-                    self.cursor.execute("""
-                        DELETE FROM account_inventory
-                        WHERE account_id = ? AND card_id = ?
-                    """, (account_id, card_id))
-                else:
-                    # Quantità positiva: Inserisci o Aggiorna (UPSERT)
-                    self.cursor.execute("""
-                        INSERT INTO account_inventory (account_id, card_id, quantity)
-                        VALUES (?, ?, ?)
-                        ON CONFLICT(account_id, card_id) 
-                        DO UPDATE SET quantity = excluded.quantity
-                    """, (account_id, card_id, new_quantity))
-                
-                self.conn.commit()
-                return True
-                
-            except Exception as e:
-                self.log_callback(f"❌ Errore set_inventory_quantity: {e}")
-                self.conn.rollback()
-                return False
+    def set_inventory_quantities(self, card_id: int, quantities: dict) -> bool:
+        """
+        Imposta in un'unica transazione le quantità di una carta per più
+        account ({account_id: quantità}): <= 0 elimina la voce,
+        altrimenti UPSERT (Insert/Update).
+        """
+        if card_id is None:
+            return False
+        if not quantities:
+            return True
+        
+        to_delete = [(account_id, card_id) for account_id, qty in quantities.items() if qty <= 0]
+        to_upsert = [(account_id, card_id, qty) for account_id, qty in quantities.items() if qty > 0]
+        
+        try:
+            if to_delete:
+                self.cursor.executemany(_Q_DELETE_INVENTORY, to_delete)
+            if to_upsert:
+                self.cursor.executemany(_Q_UPSERT_INVENTORY, to_upsert)
+            
+            # Un solo commit (e un solo fsync) per tutte le modifiche
+            self.conn.commit()
+            return True
+            
+        except Exception as e:
+            self.log_callback(f"❌ Errore set_inventory_quantities: {e}")
+            self.conn.rollback()
+            return False
     
     def validate_and_repair_database(self):
         """✅ NUOVO: Valida TUTTE le tabelle e colonne."""
@@ -463,7 +469,11 @@ class DatabaseManager:
                 ('idx_inventory_account', 'account_inventory', 'account_id', ''),
                 ('idx_found_cards_card', 'found_cards', 'card_id', ''),
                 # ✅ AGGIUNTO: Vincolo UNIQUE per l'inventario
-                ('idx_inventory_account_card_unique', 'account_inventory', '(account_id, card_id)', 'UNIQUE')
+                ('idx_inventory_account_card_unique', 'account_inventory', '(account_id, card_id)', 'UNIQUE'),
+                # Indice parziale e coprente per "chi possiede questa carta" (card_id = ? AND quantity > 0):
+                # usato da CardDetailsDialog e dalla LEFT JOIN di CollectionCardDialog.fetch_card_data,
+                # che leggono i proprietari con un range-scan già ordinato per quantità
+                ('idx_ai_card_qty', 'account_inventory', '(card_id, quantity, account_id) WHERE quantity > 0', '')
             ]
             
             for idx_name, table, column, *extra in required_indexes:
@@ -483,12 +493,77 @@ class DatabaseManager:
             
             self.conn.commit()
             
-            
             return True
         
         except Exception as e:
             return False
     
+    def shrink_card_thumbnails(self, should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Migrazione: riduce alla dimensione di importazione (250x350 JPEG) i
+        thumbnail_blob salvati a piena risoluzione, così la UI non decodifica
+        e non riscala pixel che poi scarta. Ricodifica tutti i BLOB oltre
+        _THUMB_MAX_BYTES (length() non legge il contenuto) e segna la
+        migrazione in PRAGMA user_version, quindi gira una sola volta.
+        Lenta sui DB grandi: va eseguita fuori dal thread GUI
+        (ThumbnailShrinkThread), che può interromperla con should_stop: le
+        carte già ridotte restano salvate e la migrazione riparte al prossimo
+        avvio. Restituisce il numero di carte aggiornate.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= _THUMB_SHRUNK_VERSION:
+                return 0
+            
+            from PIL import Image
+            
+            cursor.execute(
+                "SELECT id FROM cards WHERE length(thumbnail_blob) > ?",
+                (_THUMB_MAX_BYTES,)
+            )
+            card_ids = [row[0] for row in cursor.fetchall()]
+            
+            updated = 0
+            interrupted = False
+            for card_id in card_ids:
+                if should_stop is not None and should_stop():
+                    interrupted = True
+                    break
+                cursor.execute("SELECT thumbnail_blob FROM cards WHERE id = ?", (card_id,))
+                blob = cursor.fetchone()[0]
+                try:
+                    # Anche le immagini già nei limiti vengono ricodificate:
+                    # un PNG/JPEG 250x350 oltre 64 KB scende sotto la soglia
+                    img = Image.open(io.BytesIO(blob))
+                    img.thumbnail(_THUMB_MAX_SIZE, Image.Resampling.LANCZOS)
+                    if img.mode != 'RGB':
+                        img = img.convert('RGB')
+                    output = io.BytesIO()
+                    img.save(output, format='JPEG', quality=_THUMB_JPEG_QUALITY)
+                except Exception as e:
+                    self.log_callback(f"   ⚠️ Miniatura non valida (card_id={card_id}): {e}")
+                    continue
+                cursor.execute(
+                    "UPDATE cards SET thumbnail_blob = ? WHERE id = ?",
+                    (output.getvalue(), card_id)
+                )
+                updated += 1
+                if updated % _THUMB_COMMIT_EVERY == 0:
+                    self.conn.commit()
+            
+            if not interrupted:
+                cursor.execute(f"PRAGMA user_version = {_THUMB_SHRUNK_VERSION}")
+            self.conn.commit()
+            if updated:
+                self.log_callback(f"   ✅ Ridotte {updated} miniature a {_THUMB_MAX_SIZE[0]}x{_THUMB_MAX_SIZE[1]}.")
+            return updated
+        
+        except Exception as e:
+            self.log_callback(f"❌ Errore shrink_card_thumbnails: {e}")
+            self.conn.rollback()
+            return 0
+    
     def setup_database(self):
         """Crea tutte le tabelle da zero."""
         if not self.conn:
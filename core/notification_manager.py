@@ -98,10 +98,11 @@ def send_toast_notification(card_data: dict) -> bool:
                     img = img.convert('RGBA')
                 
                 # Ridimensiona per la posizione AppLogoOverride (quadrata, ~80x80)
-                img.thumbnail((80, 80), Image.Resampling.LANCZOS)
+                # BILINEAR: a 80px è indistinguibile da LANCZOS ma molto più veloce
+                img.thumbnail((80, 80), Image.Resampling.BILINEAR)
                 
-                # Salva con massima qualità
-                img.save(temp_image_path, 'PNG', optimize=False)
+                # File temporaneo riletto subito dal toast: compressione minima
+                img.save(temp_image_path, 'PNG', compress_level=1, optimize=False)
                 
                 # ✅ ASPETTA che il file sia effettivamente scritto
                 import time
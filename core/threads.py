@@ -412,4 +412,30 @@ class CollectionLoaderThread(QThread):
         except Exception as e:
             import traceback
             # L'errore "no such column: a.id" viene catturato qui
-            self.error_signal.emit(f"Error: {str(e)}\n{traceback.format_exc()}")
\ No newline at end of file
+            self.error_signal.emit(f"Error: {str(e)}\n{traceback.format_exc()}")
+
+# =========================================================================
+# 🧵 THREAD PER LA MIGRAZIONE DELLE MINIATURE
+# =========================================================================
+
+class ThumbnailShrinkThread(QThread):
+    """
+    Esegue DatabaseManager.shrink_card_thumbnails con una connessione propria,
+    così la ricodifica delle miniature non rallenta l'avvio della finestra.
+    """
+    
+    finished_signal = pyqtSignal(int)  # Numero di miniature ridotte
+    
+    def __init__(self, db_filename=DB_FILENAME):
+        super().__init__()
+        self.db_filename = db_filename
+    
+    def run(self):
+        updated = 0
+        db = DatabaseManager(self.db_filename, log_callback=print)
+        if db.connect():
+            try:
+                updated = db.shrink_card_thumbnails(should_stop=self.isInterruptionRequested)
+            finally:
+                db.close()
+        self.finished_signal.emit(updated)
@@ -40,6 +40,7 @@ from PyQt5.QtCore import (
 )
 from PyQt5.QtGui import (
     QPixmap,
+    QImage,
     QIcon,
     QFont,
     QColor,
@@ -127,7 +128,7 @@ from .cloudflare import CloudflarePasswordDialog, CloudflareTunnelThread
 from .flask_server import FlaskServerThread
 
 # Import threads
-from .threads import DiscordBotThread, ScraperThread, CollectionLoaderThread
+from .threads import DiscordBotThread, ScraperThread, CollectionLoaderThread, ThumbnailShrinkThread
 
 # =========================================================================
 # 🖥️ GUI APPLICATION - MAIN WINDOW
@@ -149,6 +150,10 @@ class MainWindow(QMainWindow):
         if db_manager.connect():
             db_manager.validate_and_repair_database()
             db_manager.close()
+            # Miniature a piena risoluzione (versioni precedenti): ridotte in
+            # background, la finestra non aspetta la ricodifica
+            self.thumbnail_shrink_thread = ThumbnailShrinkThread()
+            self.thumbnail_shrink_thread.start()
         else:
             QMessageBox.critical(
                 self, "❌ Errore Database", "Impossibile connettersi al database"
@@ -218,6 +223,11 @@ class MainWindow(QMainWindow):
         self.inventory_map = {}
         self.wishlist_map = {}  # Dict[int, bool]        # Setup UI
         self.setup_ui()
+        # Timer per il resize dello sfondo: scala veloce durante il drag,
+        # scala smooth solo quando il ridimensionamento si ferma
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._do_smooth_resize)
         self.set_background_image("gui/background.png")
         # Load settings
         self.load_settings()
@@ -1492,75 +1502,7 @@ class MainWindow(QMainWindow):
         2. Bordo ROSSO ai pixel trasparenti
         """
         try:
-            pixmap = label.property("original_pixmap")
-            if pixmap and not pixmap.isNull():
-                image = pixmap.toImage()
-
-                if image.format() != image.Format_RGBA8888:
-                    image = image.convertToFormat(image.Format_RGBA8888)
-
-                border_radius = 2
-
-                # ============================================================
-                # ✅ STEP 1: APPLICA GRAYSCALE A TUTTI I PIXEL VISIBILI
-                # ============================================================
-                for y in range(image.height()):
-                    for x in range(image.width()):
-                        pixel = image.pixel(x, y)
-                        alpha = (pixel >> 24) & 0xFF
-
-                        # Se il pixel è visibile (non trasparente), converti a grayscale
-                        if alpha > 100:
-                            r = (pixel >> 16) & 0xFF
-                            g = (pixel >> 8) & 0xFF
-                            b = pixel & 0xFF
-
-                            # Calcola luminanza (grayscale)
-                            gray = int(0.299 * r + 0.587 * g + 0.114 * b)
-
-                            # Reimposta con grayscale
-                            new_pixel = (
-                                (alpha << 24) | (gray << 16) | (gray << 8) | gray
-                            )
-                            image.setPixel(x, y, int(new_pixel))
-
-                # ============================================================
-                # ✅ STEP 2: RILEVA I BORDI (pixel trasparenti)
-                # ============================================================
-                border_mask = [[False] * image.width() for _ in range(image.height())]
-
-                for y in range(image.height()):
-                    for x in range(image.width()):
-                        pixel = image.pixel(x, y)
-                        alpha = (pixel >> 24) & 0xFF
-
-                        if alpha == 0:
-                            # Controlla se è vicino a un pixel opaco
-                            for dx in [-1, 0, 1]:
-                                for dy in [-1, 0, 1]:
-                                    nx, ny = x + dx, y + dy
-                                    if (
-                                        0 <= nx < image.width()
-                                        and 0 <= ny < image.height()
-                                    ):
-                                        neighbor = image.pixel(nx, ny)
-                                        if ((neighbor >> 24) & 0xFF) > 100:
-                                            border_mask[y][x] = True
-                                            break
-
-                # ============================================================
-                # ✅ STEP 3: APPLICA ROSSO AI BORDI RILEVATI
-                # ============================================================
-                for y in range(image.height()):
-                    for x in range(image.width()):
-                        if border_mask[y][x]:
-                            # ✅ ROSSO SEMI-TRASPARENTE
-                            new_pixel = (180 << 24) | (255 << 16) | (0 << 8) | 0
-                            image.setPixel(x, y, int(new_pixel))
-
-                painter_pixmap = QPixmap.fromImage(image)
-                label.setPixmap(painter_pixmap)
-
+            self._apply_rarity_icon_filter(label, True, (255, 0, 0, 180))
         except Exception as e:
             print(f"Error applying red border: {e}")
 
@@ -1571,55 +1513,55 @@ class MainWindow(QMainWindow):
         2. Bordo VERDE ai pixel trasparenti
         """
         try:
-            pixmap = label.property("original_pixmap")
-            if pixmap and not pixmap.isNull():
-                # ✅ COPIA ORIGINALE SENZA MODIFICHE (colori originali)
-                image = pixmap.toImage()
-
-                if image.format() != image.Format_RGBA8888:
-                    image = image.convertToFormat(image.Format_RGBA8888)
-
-                border_radius = 2
-
-                # ============================================================
-                # STEP 1: RILEVA I BORDI (pixel trasparenti)
-                # ============================================================
-                border_mask = [[False] * image.width() for _ in range(image.height())]
-
-                for y in range(image.height()):
-                    for x in range(image.width()):
-                        pixel = image.pixel(x, y)
-                        alpha = (pixel >> 24) & 0xFF
-
-                        if alpha == 0:
-                            # Controlla se è vicino a un pixel opaco
-                            for dx in [-1, 0, 1]:
-                                for dy in [-1, 0, 1]:
-                                    nx, ny = x + dx, y + dy
-                                    if (
-                                        0 <= nx < image.width()
-                                        and 0 <= ny < image.height()
-                                    ):
-                                        neighbor = image.pixel(nx, ny)
-                                        if ((neighbor >> 24) & 0xFF) > 100:
-                                            border_mask[y][x] = True
-                                            break
-
-                # ============================================================
-                # ✅ STEP 2: APPLICA VERDE AI BORDI RILEVATI
-                # ============================================================
-                for y in range(image.height()):
-                    for x in range(image.width()):
-                        if border_mask[y][x]:
-                            # ✅ VERDE SEMI-TRASPARENTE
-                            new_pixel = (180 << 24) | (0 << 16) | (255 << 8) | 0
-                            image.setPixel(x, y, int(new_pixel))
-                painter_pixmap = QPixmap.fromImage(image)
-                label.setPixmap(painter_pixmap)
-
+            self._apply_rarity_icon_filter(label, False, (0, 255, 0, 180))
         except Exception as e:
             print(f"Error applying green border: {e}")
 
+    def _apply_rarity_icon_filter(self, label, grayscale, border_rgba):
+        """
+        Elabora l'icona rarità con operazioni numpy vettorizzate
+        (nessun loop Python per pixel) e la imposta sulla label.
+        """
+        pixmap = label.property("original_pixmap")
+        if not pixmap or pixmap.isNull():
+            return
+
+        image = pixmap.toImage().convertToFormat(QImage.Format_RGBA8888)
+        width, height = image.width(), image.height()
+
+        # Vista numpy (H, W, 4) sui byte RGBA dell'immagine
+        ptr = image.constBits()
+        ptr.setsize(image.sizeInBytes())
+        arr = (
+            np.frombuffer(ptr, dtype=np.uint8)
+            .reshape(height, image.bytesPerLine())[:, : width * 4]
+            .reshape(height, width, 4)
+            .copy()
+        )
+        alpha = arr[..., 3]
+        opaque = alpha > 100
+
+        # STEP 1: Scala di grigi su tutti i pixel visibili
+        if grayscale:
+            rgb = arr[..., :3].astype(np.float64)
+            gray = (rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114).astype(np.uint8)
+            # Un solo assegnamento in broadcast sui tre canali
+            arr[opaque, :3] = gray[opaque][:, None]
+
+        # STEP 2: Bordi = pixel trasparenti con almeno un vicino (3x3) opaco
+        padded = np.pad(opaque, 1)
+        near_opaque = np.zeros_like(opaque)
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                near_opaque |= padded[dy : dy + height, dx : dx + width]
+        border_mask = (alpha == 0) & near_opaque
+
+        # STEP 3: Colore semi-trasparente sui bordi rilevati
+        arr[border_mask] = border_rgba
+
+        result = QImage(arr.data, width, height, width * 4, QImage.Format_RGBA8888).copy()
+        label.setPixmap(QPixmap.fromImage(result))
+
     # ================================================================
     # ✅ FUNZIONE HELPER - OPEN URL
     # ================================================================
@@ -3144,23 +3086,30 @@ class MainWindow(QMainWindow):
                 self.db_writer_timer.stop()
                 self.process_db_write_queue()
             
+            # Toggle wishlist non ancora salvati
+            if hasattr(self, 'wishlist_manager'):
+                self.wishlist_manager.flush()
+            
             # 2. Ferma i thread principali
             print("...arresto thread...")
             if hasattr(self, 'bot_thread') and self.bot_thread and self.bot_thread.isRunning():
-                self.bot_thread.stop() # 'stop()' è il metodo corretto per DiscordBotThread
-                self.bot_thread.wait(2000)
+                self._shutdown_thread(self.bot_thread, "bot Discord", self.bot_thread.stop)
             
             if hasattr(self, 'scraper_tab_widget') and self.scraper_tab_widget.scraper_thread and self.scraper_tab_widget.scraper_thread.isRunning():
-                self.scraper_tab_widget.stop_scraper() # Usa il metodo della scheda
-                self.scraper_tab_widget.scraper_thread.wait(2000)
+                # stop_scraper() azzera il riferimento: salva prima il thread
+                scraper_thread = self.scraper_tab_widget.scraper_thread
+                self._shutdown_thread(scraper_thread, "scraper", self.scraper_tab_widget.stop_scraper)
             
             if hasattr(self, 'flask_thread') and self.flask_thread and self.flask_thread.isRunning():
-                self.flask_thread.stop_server()
-                self.flask_thread.wait(2000)
+                self._shutdown_thread(self.flask_thread, "server Flask", self.flask_thread.stop_server)
                 
             if hasattr(self, 'tunnel_thread') and self.tunnel_thread and self.tunnel_thread.isRunning():
-                self.tunnel_thread.stop_tunnel()
-                self.tunnel_thread.wait(2000)
+                self._shutdown_thread(self.tunnel_thread, "tunnel Cloudflare", self.tunnel_thread.stop_tunnel)
+
+            if hasattr(self, 'thumbnail_shrink_thread') and self.thumbnail_shrink_thread.isRunning():
+                # Interrotta tra una carta e l'altra: riprende al prossimo avvio
+                self._shutdown_thread(self.thumbnail_shrink_thread, "miniature",
+                                      self.thumbnail_shrink_thread.requestInterruption)
 
             print("✅ Shutdown completato. Chiusura.")
             event.accept() # Permetti alla finestra di chiudersi
@@ -3180,6 +3129,21 @@ class MainWindow(QMainWindow):
                     2000 # 2 secondi
                 )
 
+    def _shutdown_thread(self, thread, name, stop):
+        """
+        Arresta un QThread in modo ordinato: richiesta di stop specifica,
+        quit() del suo event loop, wait() e terminate() solo come ultima risorsa.
+        """
+        try:
+            stop()
+        except Exception as e:
+            print(f"⚠️ Errore durante lo stop del thread {name}: {e}")
+        thread.quit()
+        if not thread.wait(2000):
+            print(f"⚠️ Il thread {name} non risponde, terminazione forzata...")
+            thread.terminate()
+            thread.wait(500)
+
     # =========================================================================
     # BACKGROUND IMAGE
     # =========================================================================
@@ -3191,37 +3155,33 @@ class MainWindow(QMainWindow):
                 print(f"⚠️ Background image not found: {image_path}")
                 return
 
-            from PIL import Image, ImageDraw, ImageEnhance
-
-            # Carica l'immagine con PIL
-            img = Image.open(image_path)
+            # Carica l'immagine direttamente in Qt (nessun passaggio PIL/PNG)
+            pixmap = QPixmap(image_path)
+            if pixmap.isNull():
+                print(f"⚠️ Cannot load background image: {image_path}")
+                return
 
             # Ridimensiona se troppo grande (per performance)
-            max_size = (1920, 1080)
-            img.thumbnail(max_size, Image.LANCZOS)
-
-            # Converti in RGBA per l'overlay
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-
-            # Crea overlay grigio scuro semitrasparente
-            overlay = Image.new(
-                "RGBA", img.size, (30, 30, 30, 180)
-            )  # RGB + Alpha (0-255)
-
-            # Combina immagine e overlay
-            img_with_overlay = Image.alpha_composite(img, overlay)
+            if pixmap.width() > 1920 or pixmap.height() > 1080:
+                pixmap = pixmap.scaled(
+                    1920, 1080, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                )
 
-            # Salva temporaneamente
-            temp_bg_path = os.path.join("gui/background_with_overlay.png")
-            img_with_overlay.save(temp_bg_path, "PNG")
+            # Overlay grigio scuro semitrasparente, disegnato una sola volta
+            painter = QPainter(pixmap)
+            painter.fillRect(pixmap.rect(), QColor(30, 30, 30, 180))
+            painter.end()
 
             # Usa come sfondo
             self.background_label = QLabel(self)
             self.background_label.setScaledContents(False)
             self.background_label.lower()
 
-            self.original_background = QPixmap(temp_bg_path)
+            self.original_background = pixmap
+            # Cache delle versioni smooth già scalate (es. massimizza/ripristina)
+            self._bg_scaled_cache = ImageCache(max_size=4)
+            self._last_bg_size = QSize()
+            self._last_bg_smooth = False
             self.update_background_size()
 
             print(f"✅ Background image with overlay set: {image_path}")
@@ -3231,15 +3191,30 @@ class MainWindow(QMainWindow):
 
             traceback.print_exc()
 
-    def update_background_size(self):
+    def update_background_size(self, transformation=Qt.SmoothTransformation):
         """Aggiorna le dimensioni dell'immagine di sfondo."""
         if hasattr(self, "background_label") and hasattr(self, "original_background"):
             window_size = self.size()
+            smooth = transformation == Qt.SmoothTransformation
 
-            # Scala in modalità cover
-            scaled_pixmap = self.original_background.scaled(
-                window_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
-            )
+            # Resize duplicato (stessa dimensione, qualità già sufficiente): niente da fare
+            if window_size == self._last_bg_size and (self._last_bg_smooth or not smooth):
+                return
+
+            cache_key = (window_size.width(), window_size.height())
+            scaled_pixmap = self._bg_scaled_cache.get(cache_key)
+            if scaled_pixmap is not None:
+                smooth = True  # In cache ci sono solo versioni smooth
+            else:
+                # Scala in modalità cover
+                scaled_pixmap = self.original_background.scaled(
+                    window_size, Qt.KeepAspectRatioByExpanding, transformation
+                )
+                if smooth:
+                    self._bg_scaled_cache.put(cache_key, scaled_pixmap)
+
+            self._last_bg_size = window_size
+            self._last_bg_smooth = smooth
 
             self.background_label.setPixmap(scaled_pixmap)
 
@@ -3253,4 +3228,11 @@ class MainWindow(QMainWindow):
     def resizeEvent(self, event):
         """Chiamato quando la finestra viene ridimensionata."""
         super().resizeEvent(event)
-        self.update_background_size()
+        # Durante il drag: scala veloce subito, quella smooth dopo 150ms di quiete
+        self.update_background_size(Qt.FastTransformation)
+        if hasattr(self, "_resize_timer"):
+            self._resize_timer.start(150)
+
+    def _do_smooth_resize(self):
+        """Scala lo sfondo in qualità piena alla dimensione finale della finestra."""
+        self.update_background_size(Qt.SmoothTransformation)
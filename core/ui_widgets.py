@@ -7,20 +7,28 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QDialog, QScrollArea, QFrame, QMessageBox, QApplication,
-    QTableWidget, QTableWidgetItem, QSizePolicy
+    QTableWidget, QTableWidgetItem, QSizePolicy, QListView, QAbstractItemView,
+    QStyledItemDelegate, QStyleOptionButton, QStyle, QToolTip
 )
 
 # Import PyQt5 - Core
-from PyQt5.QtCore import Qt, pyqtSignal, QSize, QTimer
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QSize, QRect, QRectF, QTimer, QThreadPool, QRunnable, QObject, pyqtSlot,
+    QAbstractListModel, QModelIndex, QProcess, QEvent, QUrl, QBuffer, QByteArray, QIODevice
+)
 
 # Import PyQt5 - GUI
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, qGray, qRgb, QPainter, QBrush, QPen
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImage, QImageReader, QIcon, QFont, QColor, QPainter, QBrush, QPen
+
+# Import PyQt5 - Network
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5 import sip
 
 # Import standard library
+import html
 import os
 import sqlite3
 import sys
-import subprocess
 from typing import Optional, Dict
 
 # Import configurazione
@@ -28,7 +36,6 @@ from config import get_resource_path, TCG_IMAGES_DIR, DB_FILENAME, ACCOUNTS_DIR,
 
 # Import traduzioni
 from .translations import t
-import urllib.request
 
 
 """ui_widgets.py - Widget PyQt5 personalizzati"""
@@ -44,6 +51,284 @@ import sqlite3
 from typing import Optional, Dict
 
 
+# Query ownership per CardDetailsDialog
+_Q_CARD_OWNERSHIP = """
+    SELECT a.account_name, ai.quantity
+    FROM account_inventory ai
+    JOIN accounts a ON ai.account_id = a.account_id
+    WHERE ai.card_id = ? AND ai.quantity > 0
+    ORDER BY ai.quantity DESC, a.account_name ASC
+"""
+
+
+# Icone delle rarità già scalate (rarity -> QPixmap), vedi _get_rarity_pixmap
+_RARITY_PIXMAPS: Dict[str, QPixmap] = {}
+
+# Colori del cuoricino wishlist: unica definizione, usata da CardDelegate
+# (disegno) e dallo stylesheet del pulsante di CardWidget
+_HEART_ON_BG = QColor(231, 76, 60, 200)
+_HEART_ON_HOVER_BG = QColor(231, 76, 60, 255)
+_HEART_ON_BORDER = QColor(192, 57, 43)
+_HEART_OFF_BG = QColor(0, 0, 0, 150)
+_HEART_OFF_HOVER_BG = QColor(231, 76, 60, 150)
+_HEART_OFF_BORDER = QColor(85, 85, 85)
+
+
+def _qss_rgba(color: QColor) -> str:
+    return f"rgba({color.red()}, {color.green()}, {color.blue()}, {color.alpha()})"
+
+
+# Stylesheet del pulsante wishlist di CardWidget (proprietà dinamica "wishlisted")
+_WISHLIST_BUTTON_QSS = f"""
+    QPushButton[wishlisted="true"] {{
+        background-color: {_qss_rgba(_HEART_ON_BG)};
+        border: 2px solid {_HEART_ON_BORDER.name()};
+        border-radius: 14px;
+        font-size: 16px;
+    }}
+    QPushButton[wishlisted="true"]:hover {{
+        background-color: {_qss_rgba(_HEART_ON_HOVER_BG)};
+    }}
+    QPushButton[wishlisted="false"] {{
+        background-color: {_qss_rgba(_HEART_OFF_BG)};
+        border: 2px solid {_HEART_OFF_BORDER.name()};
+        border-radius: 14px;
+        font-size: 16px;
+    }}
+    QPushButton[wishlisted="false"]:hover {{
+        background-color: {_qss_rgba(_HEART_OFF_HOVER_BG)};
+    }}
+"""
+
+# Formati immagine supportati da QImageReader, vedi _supported_image_formats
+_image_formats = None
+
+# Dettagli + proprietari per CollectionCardDialog.fetch_card_data (vedi i commenti lì)
+_Q_COLLECTION_CARD = """
+    SELECT 
+        c.card_name, s.set_name, c.set_code, 
+        c.card_number, c.rarity,
+        s.cover_image_path,
+        a.account_id, a.account_name, ai.quantity,
+        a.device_account, a.device_password,
+        COALESCE(SUM(CASE WHEN a.account_id IS NOT NULL THEN ai.quantity END) OVER (), 0) AS total_copies
+    FROM cards c
+    JOIN sets s ON c.set_code = s.set_code
+    LEFT JOIN account_inventory ai ON ai.card_id = c.id AND ai.quantity > 0
+    LEFT JOIN accounts a ON ai.account_id = a.account_id
+    WHERE c.id = ?
+    ORDER BY ai.quantity DESC, a.account_name ASC
+"""
+
+# Download delle cover dei set (creato al primo uso: serve una QApplication)
+_network_manager: Optional[QNetworkAccessManager] = None
+
+
+# =========================================================================
+# 🖼️ THUMBNAIL CACHE - Miniature condivise tra tutti i CardWidget
+# =========================================================================
+
+def _thumb_key(card_id, grayscale):
+    """Chiave QPixmapCache per la miniatura di una carta."""
+    return f"thumb:{card_id}:{int(grayscale)}"
+
+
+def _cover_key(cover_path):
+    """Chiave QPixmapCache per la cover di un set già scalata a 40px di altezza."""
+    return f"cover:{cover_path}@h40"
+
+
+def _detail_key(card_id):
+    """Chiave QPixmapCache per l'immagine grande (350x500) di CollectionCardDialog."""
+    return f"card:{card_id}:350x500"
+
+
+def _get_rarity_pixmap(rarity):
+    """
+    Icona di una rarità scalata a 25px di altezza, caricata una sola volta
+    per tutta l'applicazione. Restituisce None se la rarità non ha icona.
+    """
+    pixmap = _RARITY_PIXMAPS.get(rarity)
+    if pixmap is None:
+        if rarity not in RARITY_DATA:
+            return None
+        # Niente os.path.exists: su file mancante QPixmap è semplicemente nulla
+        # (e resta in cache anche il risultato negativo)
+        pixmap = QPixmap(get_resource_path(RARITY_DATA[rarity]))
+        if not pixmap.isNull():
+            pixmap = pixmap.scaledToHeight(25, Qt.SmoothTransformation)
+        _RARITY_PIXMAPS[rarity] = pixmap
+    return None if pixmap.isNull() else pixmap
+
+
+def _supported_image_formats():
+    """Formati leggibili da QImageReader (calcolati una sola volta)."""
+    global _image_formats
+    if _image_formats is None:
+        _image_formats = {bytes(fmt) for fmt in QImageReader.supportedImageFormats()}
+    return _image_formats
+
+
+def _get_network_manager():
+    """QNetworkAccessManager condiviso (creato al primo uso, riusa le connessioni HTTP)."""
+    global _network_manager
+    if _network_manager is None:
+        _network_manager = QNetworkAccessManager()
+    return _network_manager
+
+
+def _render_thumb_image(path, grayscale):
+    """
+    Decodifica e scala la miniatura 120x168 (senza badge) di una carta.
+    Lavora solo su QImage, quindi può girare in un thread del pool.
+    """
+    image = QImage(path)
+    if image.isNull():
+        return image
+
+    image = image.scaled(120, 168, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    # Se non posseduta, applica effetto grigio (scala di grigi al 50%)
+    if grayscale:
+        image = image.convertToFormat(QImage.Format_Grayscale8)
+
+    # Formato premoltiplicato: è quello nativo del raster engine, quindi
+    # fillRect/badge usano il blend veloce e fromImage non riconverte
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+    if grayscale:
+        painter = QPainter(image)
+        painter.fillRect(image.rect(), QColor(0, 0, 0, 128))
+        painter.end()
+
+    return image
+
+
+def _find_thumb(card_id, grayscale):
+    """Cerca la miniatura nel QPixmapCache globale. Restituisce None se assente."""
+    return QPixmapCache.find(_thumb_key(card_id, grayscale))
+
+
+def _cache_thumb(card_id, grayscale, image):
+    """
+    Converte la miniatura in QPixmap (solo nel thread GUI) e la salva nel
+    QPixmapCache: ogni PNG viene decodificato una sola volta e la stessa
+    pixmap è condivisa da tutti i widget che la mostrano.
+    """
+    pixmap = QPixmap.fromImage(image)
+    if not pixmap.isNull():
+        QPixmapCache.insert(_thumb_key(card_id, grayscale), pixmap)
+    return pixmap
+
+
+class ThumbLoaderSignals(QObject):
+    finished = pyqtSignal(int, bool, QImage)  # card_id, grayscale, immagine
+
+
+class ThumbLoader(QRunnable):
+    """Decodifica una miniatura fuori dal thread GUI."""
+
+    def __init__(self, card_id, image_path, grayscale):
+        super().__init__()
+        self.card_id = card_id
+        self.image_path = image_path
+        self.grayscale = grayscale
+        self.signals = ThumbLoaderSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            image = _render_thumb_image(self.image_path, self.grayscale)
+        except Exception as e:
+            print(f"Error loading image {self.image_path}: {e}")
+            image = QImage()
+        self.signals.finished.emit(self.card_id, self.grayscale, image)
+
+
+class _ImageLoaderSignals(QObject):
+    ready = pyqtSignal(QImage)
+
+
+class _ImageLoader(QRunnable):
+    """
+    Decodifica e scala un'immagine a piena risoluzione fuori dal thread GUI.
+    image_path può essere un percorso o i bytes dell'immagine (es. un BLOB del DB).
+    """
+
+    def __init__(self, image_path, width, height):
+        super().__init__()
+        self.image_path = image_path
+        self.width = width
+        self.height = height
+        self.signals = _ImageLoaderSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            source = self.image_path
+            if isinstance(source, bytes):
+                # fromRawData legge direttamente dai bytes Python (nessuna copia):
+                # restano vivi perché il runnable li tiene in self.image_path
+                buffer = QBuffer()
+                buffer.setData(QByteArray.fromRawData(source))
+                buffer.open(QIODevice.ReadOnly)
+                reader = QImageReader(buffer)
+            else:
+                reader = QImageReader(source)
+
+            # Scala l'immagine mantenendo l'aspect ratio già in decodifica: per i
+            # JPEG libjpeg riduce nell'IDCT (1/2, 1/4, 1/8) prima del filtro smooth
+            size = reader.size()
+            if size.isValid():
+                size.scale(self.width, self.height, Qt.KeepAspectRatio)
+                reader.setScaledSize(size)
+            image = reader.read()
+
+            if not image.isNull():
+                if not size.isValid():
+                    # Formato senza dimensioni nell'header: scala dopo la decodifica
+                    image = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                # Immagini opache (es. le carte): RGB32 è il formato nativo del
+                # raster engine, così il disegno non riconverte i pixel
+                if not image.hasAlphaChannel() and image.format() != QImage.Format_RGB32:
+                    image = image.convertToFormat(QImage.Format_RGB32)
+        except Exception as e:
+            # Immagine vuota: il pannello mostra il fallback invece di restare in caricamento
+            print(f"❌ Errore caricamento immagine: {e}")
+            image = QImage()
+        self.signals.ready.emit(image)
+
+
+# =========================================================================
+# 📂 APERTURA CARTELLE - Mai bloccante per il thread GUI
+# =========================================================================
+
+class _StartFileTask(QRunnable):
+    """Esegue os.startfile nel pool di thread (la shell di Windows può bloccare per secondi)."""
+
+    def __init__(self, folder_path):
+        super().__init__()
+        self.folder_path = folder_path
+
+    def run(self):
+        try:
+            os.startfile(self.folder_path)
+        except Exception as e:
+            print(f"❌ Errore apertura cartella {self.folder_path}: {e}")
+
+
+def _open_folder_detached(folder_path):
+    """
+    Apre una cartella nel file explorer senza attendere il processo.
+    Restituisce False se non è stato possibile avviare il programma.
+    """
+    if sys.platform == 'win32':
+        QThreadPool.globalInstance().start(_StartFileTask(folder_path))
+        return True
+    program = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    return QProcess.startDetached(program, [folder_path])
+
+
 # =========================================================================
 # 🎴 CARD WIDGET - Widget per mostrare una carta nella collezione
 # =========================================================================
@@ -54,6 +339,13 @@ class CardWidget(QWidget):
     clicked = pyqtSignal(str)
     wishlist_changed = pyqtSignal(int, bool)  # card_id, is_wishlisted
     
+    BADGE_SIZE = 25
+    _badge_cache: Dict[int, QPixmap] = {}  # quantity -> badge pre-renderizzato
+    _BADGE_BRUSH = QBrush(QColor(0, 0, 0, 250))
+    _BADGE_PEN = QPen(QColor(255, 255, 255), 2)
+    _BADGE_TEXT_COLOR = QColor(255, 255, 255)
+    _BADGE_FONT: Optional[QFont] = None  # Creato al primo uso (serve una QApplication)
+    
     def __init__(self, card_data, quantity=0, is_wishlisted=False, parent=None):
         super().__init__(parent)
         self.card_data = card_data
@@ -61,21 +353,13 @@ class CardWidget(QWidget):
         self.card_id = card_data['id']
         self.is_wishlisted = is_wishlisted
         
-        # Layout principale
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(2)
-        
-        # Container per immagine + cuoricino
-        image_container = QWidget()
-        image_container.setFixedSize(120, 168)
-        image_layout = QVBoxLayout(image_container)
-        image_layout.setContentsMargins(0, 0, 0, 0)
-        image_layout.setSpacing(0)
+        # Dimensione fissa: posizionamento assoluto dei figli, nessun layout
+        # (niente QVBoxLayout/container per carta né ricalcolo geometrie allo show)
+        self.setFixedSize(120, 190)
         
         # Label per l'immagine (caricamento lazy)
-        self.image_label = QLabel()
-        self.image_label.setFixedSize(120, 168)
+        self.image_label = QLabel(self)
+        self.image_label.setGeometry(0, 0, 120, 168)
         self.image_label.setAlignment(Qt.AlignCenter)
         self.image_label.setStyleSheet("QLabel { border: 1px solid #555; background-color: #2a2a2a; }")
         self.image_loaded = False  # Flag per lazy loading
@@ -83,26 +367,20 @@ class CardWidget(QWidget):
         # Placeholder iniziale
         self.image_label.setText("🎴")
         
-        image_layout.addWidget(self.image_label)
-        
         # Cuoricino wishlist (sopra l'immagine, angolo in alto a sinistra)
-        self.wishlist_btn = QPushButton()
-        self.wishlist_btn.setFixedSize(28, 28)
+        self.wishlist_btn = QPushButton(self)
+        self.wishlist_btn.setGeometry(2, 2, 28, 28)
         self.wishlist_btn.setCheckable(True)
         self.wishlist_btn.setChecked(is_wishlisted)
+        self.wishlist_btn.setStyleSheet(_WISHLIST_BUTTON_QSS)
         self.update_wishlist_style()
         self.wishlist_btn.clicked.connect(self.toggle_wishlist)
-        self.wishlist_btn.setParent(image_container)
-        self.wishlist_btn.move(2, 2)  # Angolo in alto a sinistra
-        
-        main_layout.addWidget(image_container)
         
         # Label per il numero della carta (larghezza fissa uguale all'immagine)
-        card_num_label = QLabel(f"#{card_data['card_number']}")
-        card_num_label.setFixedWidth(120)
+        card_num_label = QLabel(f"#{card_data['card_number']}", self)
+        card_num_label.setGeometry(0, 170, 120, 18)
         card_num_label.setAlignment(Qt.AlignCenter)
         card_num_label.setStyleSheet("QLabel { font-size: 9px; color: #888; }")
-        main_layout.addWidget(card_num_label)
         
         # Abilita click
         self.setCursor(Qt.PointingHandCursor)
@@ -115,33 +393,13 @@ class CardWidget(QWidget):
             self.image_loaded = True
     
     def update_wishlist_style(self):
-        """Aggiorna lo stile del pulsante wishlist."""
-        if self.is_wishlisted:
-            self.wishlist_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(231, 76, 60, 200);
-                    border: 2px solid #c0392b;
-                    border-radius: 14px;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(231, 76, 60, 255);
-                }
-            """)
-            self.wishlist_btn.setText("❤️")
-        else:
-            self.wishlist_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(0, 0, 0, 150);
-                    border: 2px solid #555;
-                    border-radius: 14px;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(231, 76, 60, 150);
-                }
-            """)
-            self.wishlist_btn.setText("🤍")
+        """Aggiorna lo stile del pulsante wishlist (regole di _WISHLIST_BUTTON_QSS)."""
+        self.wishlist_btn.setProperty("wishlisted", self.is_wishlisted)
+        self.wishlist_btn.setText("❤️" if self.is_wishlisted else "🤍")
+        # Ri-applica lo stylesheet per il nuovo valore della proprietà
+        style = self.wishlist_btn.style()
+        style.unpolish(self.wishlist_btn)
+        style.polish(self.wishlist_btn)
     
     def toggle_wishlist(self):
         """Toggle dello stato wishlist."""
@@ -150,63 +408,83 @@ class CardWidget(QWidget):
         self.wishlist_changed.emit(self.card_id, self.is_wishlisted)
     
     def load_image(self):
-        """Carica l'immagine della carta."""
+        """Carica l'immagine della carta (dalla cache o in background)."""
         image_path = self.card_data.get('local_image_path')
         
         if image_path and os.path.exists(image_path):
-            try:
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(120, 168, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    
-                    # Se non posseduta (quantity = 0), applica effetto grigio
-                    if self.quantity == 0:
-                        image = scaled_pixmap.toImage()
-                        for y in range(image.height()):
-                            for x in range(image.width()):
-                                pixel = image.pixel(x, y)
-                                gray = qGray(pixel)
-                                gray = int(gray * 0.5)
-                                image.setPixel(x, y, qRgb(gray, gray, gray))
-                        scaled_pixmap = QPixmap.fromImage(image)
-                    
-                    self.image_label.setPixmap(scaled_pixmap)
-                    
-                    # Aggiungi badge con il numero di copie se > 0
-                    if self.quantity > 0:
-                        self.add_quantity_badge()
-                else:
-                    self.image_label.setText("❌")
-            except Exception as e:
-                self.image_label.setText("❌")
-                print(f"Error loading image {image_path}: {e}")
+            grayscale = self.quantity == 0
+            
+            # Miniatura già decodificata: mostrala subito
+            pixmap = _find_thumb(self.card_id, grayscale)
+            if pixmap is not None:
+                self.show_thumb(pixmap)
+                return
+            
+            # Altrimenti decodifica nel pool di thread (il GUI thread resta libero)
+            loader = ThumbLoader(self.card_id, image_path, grayscale)
+            loader.signals.finished.connect(self.on_thumb_loaded)
+            QThreadPool.globalInstance().start(loader)
         else:
             self.image_label.setText("🎴")
     
+    @pyqtSlot(int, bool, QImage)
+    def on_thumb_loaded(self, card_id, grayscale, image):
+        """Slot chiamato nel thread GUI quando la miniatura è pronta."""
+        if image.isNull():
+            self.image_label.setText("❌")
+            return
+        self.show_thumb(_cache_thumb(card_id, grayscale, image))
+    
+    def show_thumb(self, pixmap):
+        """Mostra la miniatura base e sovrappone il badge su una copia per-widget."""
+        self.image_label.setPixmap(pixmap)
+        
+        # Aggiungi badge con il numero di copie se > 0
+        if self.quantity > 0:
+            self.add_quantity_badge()
+    
+    @classmethod
+    def _get_badge_pixmap(cls, quantity):
+        """Restituisce il badge per una quantità (renderizzato una sola volta e riusato)."""
+        badge = cls._badge_cache.get(quantity)
+        if badge is None:
+            # 1px di margine per il bordo da 2px attorno al cerchio
+            badge_size = cls.BADGE_SIZE
+            badge = QPixmap(badge_size + 2, badge_size + 2)
+            badge.fill(Qt.transparent)
+            
+            if cls._BADGE_FONT is None:
+                cls._BADGE_FONT = QFont("Arial", 10, QFont.Bold)
+            
+            painter = QPainter(badge)
+            
+            # Sfondo nero semi-trasparente
+            painter.setBrush(cls._BADGE_BRUSH)
+            painter.setPen(cls._BADGE_PEN)
+            painter.drawEllipse(1, 1, badge_size, badge_size)
+            
+            # Testo con il numero
+            painter.setFont(cls._BADGE_FONT)
+            painter.setPen(cls._BADGE_TEXT_COLOR)
+            painter.drawText(1, 1, badge_size, badge_size, Qt.AlignCenter, str(quantity))
+            
+            painter.end()
+            cls._badge_cache[quantity] = badge
+        return badge
+    
     def add_quantity_badge(self):
         """Aggiunge un badge con il numero di copie possedute."""
         current_pixmap = self.image_label.pixmap()
         if current_pixmap and not current_pixmap.isNull():
             pixmap_copy = current_pixmap.copy()
-            
-            painter = QPainter(pixmap_copy)
+            badge = self._get_badge_pixmap(self.quantity)
             
             # Badge in basso a destra
-            badge_size = 25
-            x = pixmap_copy.width() - badge_size - 3
-            y = pixmap_copy.height() - badge_size - 3
-            
-            # Sfondo nero semi-trasparente
-            painter.setBrush(QBrush(QColor(0, 0, 0, 250)))
-            painter.setPen(QPen(QColor(255, 255, 255), 2))
-            painter.drawEllipse(x, y, badge_size, badge_size)
-            
-            # Testo con il numero
-            painter.setFont(QFont("Arial", 10, QFont.Bold))
-            painter.setPen(QColor(255, 255, 255))
-            text = str(self.quantity)
-            painter.drawText(x, y, badge_size, badge_size, Qt.AlignCenter, text)
+            x = pixmap_copy.width() - self.BADGE_SIZE - 3 - 1
+            y = pixmap_copy.height() - self.BADGE_SIZE - 3 - 1
             
+            painter = QPainter(pixmap_copy)
+            painter.drawPixmap(x, y, badge)
             painter.end()
             self.image_label.setPixmap(pixmap_copy)
     
@@ -221,6 +499,337 @@ class CardWidget(QWidget):
             dialog = CardDetailsDialog(self.card_data, self)
             dialog.exec_()
 
+# =========================================================================
+# 🗂️ CARD LIST - Griglia model/view (nessun widget per carta)
+# =========================================================================
+
+class CardListModel(QAbstractListModel):
+    """
+    Modello delle carte di un set per CardListView (scheda Collezione).
+    cards è una lista di (card_id, card_name, rarity, card_number, image_blob,
+    quantity, is_wishlisted); la miniatura viene decodificata dal BLOB nel pool
+    di thread solo quando la carta viene disegnata, poi resta in image_cache.
+    """
+
+    CardIdRole = Qt.UserRole + 1
+    QuantityRole = Qt.UserRole + 2
+    WishlistRole = Qt.UserRole + 3
+    RarityRole = Qt.UserRole + 4
+
+    wishlist_changed = pyqtSignal(int, bool)  # card_id, is_wishlisted
+
+    def __init__(self, cards, image_cache, placeholder, parent=None):
+        super().__init__(parent)
+        self._image_cache = image_cache
+        self._placeholder = placeholder  # Pixmap 120x160 per le carte senza immagine
+        self._cards = []
+        self._rows_by_id: Dict[int, int] = {}
+        self._pending = set()  # card_id in decodifica
+        self.set_cards(cards)
+
+    def set_cards(self, cards):
+        """Sostituisce le righe del modello."""
+        self.beginResetModel()
+        self._cards = [
+            {
+                'card_id': card_id, 'card_name': card_name, 'rarity': rarity,
+                'card_number': card_number, 'image_blob': image_blob,
+                'quantity': quantity, 'is_wishlisted': is_wishlisted,
+            }
+            for card_id, card_name, rarity, card_number, image_blob, quantity, is_wishlisted in cards
+        ]
+        self._rows_by_id = {row['card_id']: i for i, row in enumerate(self._cards)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cards)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._cards[index.row()]
+
+        if role == Qt.DisplayRole:
+            return f"#{row['card_number']} {row['card_name']}"
+        if role == Qt.DecorationRole:
+            return self._thumb_for(row)
+        if role == Qt.ToolTipRole:
+            return row['rarity']
+        if role == self.CardIdRole:
+            return row['card_id']
+        if role == self.QuantityRole:
+            return row['quantity']
+        if role == self.WishlistRole:
+            return row['is_wishlisted']
+        if role == self.RarityRole:
+            return row['rarity']
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != self.WishlistRole:
+            return False
+        row = self._cards[index.row()]
+        row['is_wishlisted'] = bool(value)
+        self.dataChanged.emit(index, index, [self.WishlistRole])
+        self.wishlist_changed.emit(row['card_id'], row['is_wishlisted'])
+        return True
+
+    def _thumb_for(self, row):
+        """
+        Miniatura 120x160 dalla cache; se manca avvia la decodifica del BLOB
+        nel pool di thread e restituisce il placeholder finché non è pronta.
+        """
+        card_id = row['card_id']
+        pixmap = self._image_cache.get(card_id)
+        if pixmap is not None:
+            return pixmap
+
+        image_blob = row['image_blob']
+        if image_blob and card_id not in self._pending:
+            self._pending.add(card_id)
+            loader = _ImageLoader(image_blob, 120, 160)
+            loader.signals.ready.connect(
+                lambda image, card_id=card_id: self._on_thumb_ready(card_id, image)
+            )
+            QThreadPool.globalInstance().start(loader)
+        return self._placeholder
+
+    def _on_thumb_ready(self, card_id, image):
+        """Slot del caricamento nel pool: mette in cache la miniatura e ridisegna la carta."""
+        if sip.isdeleted(self):
+            return
+        self._pending.discard(card_id)
+        row = self._rows_by_id.get(card_id)
+        if row is None:
+            return
+
+        if image.isNull():
+            # BLOB non decodificabile: resta il placeholder, niente nuovi tentativi
+            self._cards[row]['image_blob'] = None
+        else:
+            self._image_cache.put(card_id, QPixmap.fromImage(image))
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class CardDelegate(QStyledItemDelegate):
+    """
+    Disegna una carta della collezione (miniatura, quantità, cuoricino, nome e
+    rarità) con un solo QPainter: stesso aspetto della vecchia card a widget.
+    """
+
+    CARD_SIZE = QSize(120, 210)
+    IMAGE_RECT = QRect(0, 0, 120, 160)
+    HEART_RECT = QRect(0, 0, 28, 28)
+    NAME_RECT = QRect(2, 162, 116, 24)
+    SEPARATOR_Y = 189
+    RARITY_RECT = QRect(0, 190, 120, 20)
+
+    _CARD_BG = QColor(51, 51, 51)
+    _SEPARATOR_COLOR = QColor(85, 85, 85)
+    _TEXT_COLOR = QColor(255, 255, 255)
+    _QUANTITY_BG = QColor(0, 0, 0)
+    _HEART_ON_BRUSH = QBrush(_HEART_ON_BG)
+    _HEART_ON_PEN = QPen(_HEART_ON_BORDER, 2)
+    _HEART_OFF_BRUSH = QBrush(_HEART_OFF_BG)
+    _HEART_OFF_PEN = QPen(_HEART_OFF_BORDER, 2)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Font creati qui (serve una QApplication), poi riusati per ogni carta
+        self._name_font = QFont()
+        self._name_font.setPixelSize(9)
+        self._name_font.setBold(True)
+        self._quantity_font = QFont()
+        self._quantity_font.setBold(True)
+        self._heart_font = QFont()
+        self._heart_font.setPixelSize(16)
+        self._rarity_pixmaps: Dict[str, Optional[QPixmap]] = {}  # rarità -> icona alta 20px
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def _rarity_pixmap(self, rarity):
+        """Icona della rarità alta 20px (caricata una sola volta), None se assente."""
+        if rarity not in self._rarity_pixmaps:
+            pixmap = None
+            if rarity in RARITY_DATA:
+                pixmap = QPixmap(get_resource_path(RARITY_DATA[rarity]))
+                pixmap = None if pixmap.isNull() else pixmap.scaledToHeight(20, Qt.SmoothTransformation)
+            self._rarity_pixmaps[rarity] = pixmap
+        return self._rarity_pixmaps[rarity]
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        origin = option.rect.topLeft()
+        painter.fillRect(QRect(origin, self.CARD_SIZE), self._CARD_BG)
+
+        # Carta non posseduta: immagine e cuoricino al 40%, niente quantità
+        quantity = index.data(CardListModel.QuantityRole) or 0
+        if quantity == 0:
+            painter.setOpacity(0.4)
+
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(self.IMAGE_RECT.translated(origin), pixmap)
+
+        if quantity > 0:
+            # Etichetta "xN" in basso a destra (margine 5px, padding 2px 5px)
+            text = f"x{quantity}"
+            painter.setFont(self._quantity_font)
+            metrics = painter.fontMetrics()
+            width = metrics.horizontalAdvance(text) + 10
+            height = metrics.height() + 4
+            image_rect = self.IMAGE_RECT.translated(origin)
+            label_rect = QRect(image_rect.right() - 5 - width + 1, image_rect.bottom() - 5 - height + 1,
+                               width, height)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._QUANTITY_BG)
+            painter.drawRoundedRect(label_rect, 5, 5)
+            painter.setPen(self._TEXT_COLOR)
+            painter.drawText(label_rect, Qt.AlignCenter, text)
+
+        # Cuoricino wishlist (colori _HEART_* condivisi con CardWidget)
+        is_wishlisted = bool(index.data(CardListModel.WishlistRole))
+        heart_rect = self.HEART_RECT.translated(origin)
+        if is_wishlisted:
+            painter.setBrush(self._HEART_ON_BRUSH)
+            painter.setPen(self._HEART_ON_PEN)
+        else:
+            painter.setBrush(self._HEART_OFF_BRUSH)
+            painter.setPen(self._HEART_OFF_PEN)
+        painter.drawEllipse(heart_rect.adjusted(1, 1, -1, -1))
+        painter.setFont(self._heart_font)
+        painter.drawText(heart_rect, Qt.AlignCenter, "❤️" if is_wishlisted else "🤍")
+        painter.setOpacity(1.0)
+
+        # Nome, separatore e rarità sotto l'immagine
+        painter.setFont(self._name_font)
+        painter.setPen(self._TEXT_COLOR)
+        painter.drawText(self.NAME_RECT.translated(origin), Qt.AlignCenter | Qt.TextWordWrap,
+                         index.data(Qt.DisplayRole))
+
+        separator_y = origin.y() + self.SEPARATOR_Y
+        painter.setPen(self._SEPARATOR_COLOR)
+        painter.drawLine(origin.x(), separator_y, origin.x() + self.CARD_SIZE.width() - 1, separator_y)
+
+        rarity = index.data(CardListModel.RarityRole)
+        rarity_rect = self.RARITY_RECT.translated(origin)
+        rarity_pixmap = self._rarity_pixmap(rarity)
+        if rarity_pixmap is not None:
+            painter.drawPixmap(rarity_rect.x() + (rarity_rect.width() - rarity_pixmap.width()) // 2,
+                               rarity_rect.y(), rarity_pixmap)
+        elif rarity:
+            painter.setPen(self._TEXT_COLOR)
+            painter.drawText(rarity_rect, Qt.AlignCenter, rarity)
+
+        painter.restore()
+
+
+class CardListView(QListView):
+    """
+    Griglia delle carte di un set: un solo widget per set, le carte sono
+    disegnate da CardDelegate e Qt dipinge solo quelle nel viewport.
+    """
+
+    GRID_SIZE = QSize(130, 220)  # CardDelegate.CARD_SIZE + 10px di spaziatura
+
+    card_clicked = pyqtSignal(int)  # card_id
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setGridSize(self.GRID_SIZE)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setCursor(Qt.PointingHandCursor)
+
+        self.setItemDelegate(CardDelegate(self))
+        self.setModel(model)
+        self.clicked.connect(self._emit_card_clicked)
+
+    def _wishlist_index_at(self, pos):
+        """Indice della carta se pos cade sul suo cuoricino, altrimenti None."""
+        index = self.indexAt(pos)
+        if index.isValid():
+            heart_rect = CardDelegate.HEART_RECT.translated(self.visualRect(index).topLeft())
+            if heart_rect.contains(pos):
+                return index
+        return None
+
+    def mousePressEvent(self, event):
+        # Il click sul cuoricino non deve avviare il click sulla carta
+        if event.button() == Qt.LeftButton and self._wishlist_index_at(event.pos()) is not None:
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """Click sul cuoricino: toggle della wishlist senza aprire il dialog."""
+        if event.button() == Qt.LeftButton:
+            index = self._wishlist_index_at(event.pos())
+            if index is not None:
+                self.model().setData(index, not index.data(CardListModel.WishlistRole),
+                                     CardListModel.WishlistRole)
+                event.accept()
+                return
+        super().mouseReleaseEvent(event)
+
+    def _emit_card_clicked(self, index):
+        self.card_clicked.emit(index.data(CardListModel.CardIdRole))
+
+# =========================================================================
+# 🔘 ACTION BUTTON DELEGATE - Pulsante disegnato nelle celle di una tabella
+# =========================================================================
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Disegna un pulsante in ogni cella della colonna e gestisce il click,
+    senza creare widget per riga. Il valore passato al segnale è il
+    dato Qt.UserRole della cella.
+    """
+
+    clicked = pyqtSignal(object)
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self._pressed = None  # (row, column) della cella premuta
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(5, 2, -5, -2)
+        button.text = self.text
+        button.state = QStyle.State_Enabled
+        if self._pressed == (index.row(), index.column()):
+            button.state |= QStyle.State_Sunken
+        else:
+            button.state |= QStyle.State_Raised
+        if option.state & QStyle.State_MouseOver:
+            button.state |= QStyle.State_MouseOver
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self._pressed = (index.row(), index.column())
+            return True
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            was_pressed = self._pressed == (index.row(), index.column())
+            self._pressed = None
+            if was_pressed and option.rect.contains(event.pos()):
+                self.clicked.emit(index.data(Qt.UserRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
 # =========================================================================
 # 📊 CARD DETAILS DIALOG - Mostra dettagli carta e ownership
 # =========================================================================
@@ -298,6 +907,11 @@ class CardDetailsDialog(QDialog):
         self.ownership_table.setEditTriggers(QTableWidget.NoEditTriggers)
         self.ownership_table.setAlternatingRowColors(True)
         
+        # Pulsante "Open XML folder" disegnato dal delegate (nessun widget per riga)
+        self.xml_button_delegate = ButtonDelegate(t("card_details_ui.open_xml_folder"), self.ownership_table)
+        self.xml_button_delegate.clicked.connect(self.open_xml_folder)
+        self.ownership_table.setItemDelegateForColumn(2, self.xml_button_delegate)
+        
         self.load_ownership_data()
         
         right_layout.addWidget(self.ownership_table)
@@ -322,7 +936,8 @@ class CardDetailsDialog(QDialog):
         """Carica l'immagine della carta."""
         image_path = self.card_data.get('local_image_path')
         
-        if image_path and os.path.exists(image_path):
+        if image_path:
+            # QPixmap è nulla se il file manca: nessun os.path.exists separato
             pixmap = QPixmap(image_path)
             if not pixmap.isNull():
                 scaled_pixmap = pixmap.scaled(300, 420, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -333,70 +948,42 @@ class CardDetailsDialog(QDialog):
             self.image_label.setText("🎴 " + t("card_details.no_image"))
     
     def load_ownership_data(self):
-        """Carica i dati di ownership dal database."""
+        """Carica i dati di ownership dal database (e calcola i totali dalle stesse righe)."""
+        self._total_copies = 0
+        self._total_accounts = 0
         try:
+            # Recupera tutti gli account che possiedono questa carta
             with sqlite3.connect(DB_FILENAME) as conn:
-                cursor = conn.cursor()
-                
-                # Recupera tutti gli account che possiedono questa carta
-                cursor.execute("""
-                    SELECT a.account_name, ai.quantity
-                    FROM account_inventory ai
-                    JOIN accounts a ON ai.account_id = a.account_id
-                    WHERE ai.card_id = ? AND ai.quantity > 0
-                    ORDER BY ai.quantity DESC, a.account_name ASC
-                """, (self.card_id,))
-                
-                results = cursor.fetchall()
+                results = conn.execute(_Q_CARD_OWNERSHIP, (self.card_id,)).fetchall()
+            
+            # Totali calcolati dalle righe già lette (niente seconda query)
+            self._total_copies = sum(quantity for _, quantity in results)
+            self._total_accounts = len(results)
+            
+            self.ownership_table.setRowCount(len(results))
+            
+            for row_idx, (account_name, quantity) in enumerate(results):
+                # Colonna 0: Account name
+                account_item = QTableWidgetItem(account_name)
+                self.ownership_table.setItem(row_idx, 0, account_item)
                 
-                self.ownership_table.setRowCount(len(results))
+                # Colonna 1: Quantity
+                quantity_item = QTableWidgetItem(str(quantity))
+                quantity_item.setTextAlignment(Qt.AlignCenter)
+                self.ownership_table.setItem(row_idx, 1, quantity_item)
                 
-                for row_idx, (account_name, quantity) in enumerate(results):
-                    # Colonna 0: Account name
-                    account_item = QTableWidgetItem(account_name)
-                    self.ownership_table.setItem(row_idx, 0, account_item)
-                    
-                    # Colonna 1: Quantity
-                    quantity_item = QTableWidgetItem(str(quantity))
-                    quantity_item.setTextAlignment(Qt.AlignCenter)
-                    self.ownership_table.setItem(row_idx, 1, quantity_item)
-                    
-                    # Colonna 2: Action button
-                    action_widget = QWidget()
-                    action_layout = QHBoxLayout(action_widget)
-                    action_layout.setContentsMargins(5, 2, 5, 2)
-                    
-                    xml_btn = QPushButton(t("card_details_ui.open_xml_folder"))
-                    xml_btn.setStyleSheet("QPushButton { padding: 4px 8px; font-size: 10px; }")
-                    xml_btn.clicked.connect(lambda checked, acc=account_name: self.open_xml_folder(acc))
-                    action_layout.addWidget(xml_btn)
-                    
-                    self.ownership_table.setCellWidget(row_idx, 2, action_widget)
+                # Colonna 2: Action button (disegnato da ButtonDelegate)
+                action_item = QTableWidgetItem()
+                action_item.setData(Qt.UserRole, account_name)
+                self.ownership_table.setItem(row_idx, 2, action_item)
         
         except Exception as e:
             print(f"Error loading ownership data: {e}")
             QMessageBox.warning(self, t("ui.error"), t("card_details_ui.failed_load_ownership") + f": {str(e)}")
     
     def get_total_stats(self):
-        """Calcola le statistiche totali."""
-        try:
-            with sqlite3.connect(DB_FILENAME) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT SUM(quantity), COUNT(DISTINCT account_id)
-                    FROM account_inventory
-                    WHERE card_id = ? AND quantity > 0
-                """, (self.card_id,))
-                
-                result = cursor.fetchone()
-                total_copies = result[0] if result[0] else 0
-                total_accounts = result[1] if result[1] else 0
-                
-                return total_copies, total_accounts
-        except Exception as e:
-            print(f"Error getting stats: {e}")
-            return 0, 0
+        """Restituisce le statistiche totali calcolate in load_ownership_data."""
+        return self._total_copies, self._total_accounts
     
     def open_card_folder(self):
         """Apre la cartella contenente l'immagine della carta."""
@@ -419,16 +1006,9 @@ class CardDetailsDialog(QDialog):
             QMessageBox.warning(self, t("ui.error"), t("card_details_ui.cannot_open_folder", error=str(e)))
     
     def open_folder(self, folder_path):
-        """Apre una cartella nel file explorer."""
-        try:
-            if sys.platform == 'win32':
-                os.startfile(folder_path)
-            elif sys.platform == 'darwin':
-                subprocess.run(['open', folder_path])
-            else:
-                subprocess.run(['xdg-open', folder_path])
-        except Exception as e:
-            QMessageBox.warning(self, t("ui.error"), t("card_details_ui.cannot_open_folder", error=str(e)))
+        """Apre una cartella nel file explorer (senza bloccare il dialog)."""
+        if not _open_folder_detached(folder_path):
+            QMessageBox.warning(self, t("ui.error"), t("card_details_ui.cannot_open_folder", error=folder_path))
 
 
 # =========================================================================
@@ -440,7 +1020,10 @@ class ImageViewerDialog(QDialog):
     
     def __init__(self, image_path, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(os.path.basename(image_path))
+        dir_name, file_name = os.path.split(image_path)
+        # Cartella da aprire con "Apri cartella", calcolata una sola volta
+        self._folder = os.path.dirname(os.path.abspath(image_path))
+        self.setWindowTitle(file_name)
         self.setModal(True)
         
         # Dimensioni finestra
@@ -453,24 +1036,16 @@ class ImageViewerDialog(QDialog):
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignCenter)
         
-        # Carica e mostra l'immagine
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            # Scala l'immagine mantenendo l'aspect ratio
-            scaled_pixmap = pixmap.scaled(
-                self.width() - 40, 
-                self.height() - 100, 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
-        else:
-            self.image_label.setText("❌ " + t("card_details.cannot_load_image"))
+        # Decodifica e scala l'immagine nel pool di thread (il dialog si apre subito)
+        self.image_label.setText("⏳ " + t("card_details.loading_image"))
+        loader = _ImageLoader(image_path, self.width() - 40, self.height() - 100)
+        loader.signals.ready.connect(self.on_image_ready)
+        QThreadPool.globalInstance().start(loader)
         
         layout.addWidget(self.image_label)
         
         # Info label
-        info_label = QLabel(f"📁 {os.path.dirname(image_path)}\n📄 {os.path.basename(image_path)}")
+        info_label = QLabel(f"📁 {dir_name}\n📄 {file_name}")
         info_label.setStyleSheet("QLabel { color: #888; font-size: 10px; padding: 5px; }")
         layout.addWidget(info_label)
         
@@ -478,7 +1053,7 @@ class ImageViewerDialog(QDialog):
         button_layout = QHBoxLayout()
         
         open_folder_btn = QPushButton(t("card_details_ui.open_folder"))
-        open_folder_btn.clicked.connect(lambda: self.open_folder(image_path))
+        open_folder_btn.clicked.connect(self.open_folder)
         open_folder_btn.setStyleSheet("QPushButton { padding: 5px 15px; }")
         button_layout.addWidget(open_folder_btn)
         
@@ -491,18 +1066,207 @@ class ImageViewerDialog(QDialog):
         
         layout.addLayout(button_layout)
     
-    def open_folder(self, file_path):
+    @pyqtSlot(QImage)
+    def on_image_ready(self, image):
+        """Slot chiamato nel thread GUI quando l'immagine è pronta."""
+        if image.isNull():
+            self.image_label.setText("❌ " + t("card_details.cannot_load_image"))
+        else:
+            self.image_label.setPixmap(QPixmap.fromImage(image))
+    
+    def open_folder(self):
         """Apre la cartella contenente il file."""
-        folder = os.path.dirname(os.path.abspath(file_path))
-        try:
-            if sys.platform == 'win32':
-                os.startfile(folder)
-            elif sys.platform == 'darwin':
-                subprocess.run(['open', folder])
+        if not _open_folder_detached(self._folder):
+            QMessageBox.warning(self, t("ui.error"), t("card_details_ui.cannot_open_folder", error=self._folder))
+
+# =========================================================================
+# 👥 OWNERS LIST - Proprietari di una carta (model/view, nessun widget per riga)
+# =========================================================================
+
+class OwnersModel(QAbstractListModel):
+    """
+    Elenco dei proprietari di una carta per CollectionCardDialog.
+    Ogni riga è la lista [account_id, account_name, quantity,
+    device_account, device_password] di card_data['owners'], che il
+    modello modifica sul posto.
+    """
+
+    def __init__(self, owners, parent=None):
+        super().__init__(parent)
+        self.owners = owners
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.owners)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        owner = self.owners[index.row()]
+        if role == Qt.DisplayRole:
+            return owner[1]
+        if role == Qt.UserRole:
+            return owner
+        return None
+
+    def quantity(self, row):
+        return self.owners[row][2]
+
+    def set_quantity(self, row, quantity):
+        """Aggiorna la quantità di una riga e ridisegna solo quella."""
+        self.owners[row][2] = quantity
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.UserRole])
+
+    def remove_owner(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.owners[row]
+        self.endRemoveRows()
+
+
+class OwnerDelegate(QStyledItemDelegate):
+    """
+    Disegna una riga proprietario (nome, badge copie e pulsanti −, +, XML)
+    con gli stessi colori dello stile precedente a widget, e gestisce i
+    click sui pulsanti in editorEvent.
+    """
+
+    quantity_change_requested = pyqtSignal(int, int)  # account_id, delta
+    xml_export_requested = pyqtSignal(object)  # riga del proprietario
+
+    ROW_HEIGHT = 56
+    BUTTON_SIZE = 36
+    BUTTON_SPACING = 6
+    MARGIN = 10
+
+    _CARD_BG = QColor("#2A2A2A")
+    _CARD_BG_HOVER = QColor("#2F2F2F")
+    _CARD_BORDER = QColor("#3A3A3A")
+    _CARD_BORDER_HOVER = QColor("#4A4A4A")
+    _NAME_COLOR = QColor("#E0E0E0")
+    _BADGE_BG = QColor("#314C6B")
+    _WHITE = QColor("#FFFFFF")
+    # azione -> (sfondo, sfondo premuto, bordo)
+    _BUTTON_COLORS = {
+        'minus': (QColor("#5A3A3A"), QColor("#4A2A2A"), QColor("#8B4444")),
+        'plus': (QColor("#2E5A44"), QColor("#244A34"), QColor("#449966")),
+        'xml': (QColor("#314C6B"), QColor("#243A5A"), QColor("#4477AA")),
+    }
+    _BUTTON_TEXT = {'minus': "−", 'plus': "+"}
+
+    def __init__(self, xml_icon, parent=None):
+        super().__init__(parent)
+        self.xml_icon = xml_icon
+        self._pressed = None  # (row, azione) del pulsante premuto
+
+        self._name_font = QFont()
+        self._name_font.setPixelSize(14)
+        self._name_font.setBold(True)
+        self._badge_font = QFont()
+        self._badge_font.setPixelSize(12)
+        self._badge_font.setBold(True)
+        self._button_font = QFont()
+        self._button_font.setPixelSize(20)
+        self._button_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _button_rects(self, rect):
+        """Rettangoli dei pulsanti (da sinistra: −, +, XML) allineati a destra."""
+        size = self.BUTTON_SIZE
+        y = rect.y() + (rect.height() - size) // 2
+        x = rect.right() - self.MARGIN - size
+        xml_rect = QRect(x, y, size, size)
+        plus_rect = xml_rect.translated(-(size + self.BUTTON_SPACING), 0)
+        minus_rect = plus_rect.translated(-(size + self.BUTTON_SPACING), 0)
+        return (('minus', minus_rect), ('plus', plus_rect), ('xml', xml_rect))
+
+    def paint(self, painter, option, index):
+        account_id, account_name, quantity, _, _ = index.data(Qt.UserRole)
+        rect = option.rect
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card
+        painter.setPen(QPen(self._CARD_BORDER_HOVER if hovered else self._CARD_BORDER, 1))
+        painter.setBrush(self._CARD_BG_HOVER if hovered else self._CARD_BG)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+
+        # Nome account
+        painter.setFont(self._name_font)
+        painter.setPen(self._NAME_COLOR)
+        painter.drawText(QRect(rect.x() + self.MARGIN, rect.y() + 8, rect.width() // 2, 20),
+                         Qt.AlignLeft | Qt.AlignVCenter, account_name)
+
+        # Badge copie
+        badge_text = f"🃏 {quantity}"
+        painter.setFont(self._badge_font)
+        badge_width = painter.fontMetrics().horizontalAdvance(badge_text) + 16
+        badge_rect = QRect(rect.x() + self.MARGIN, rect.y() + 30, badge_width, 18)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._BADGE_BG)
+        painter.drawRoundedRect(badge_rect, 8, 8)
+        painter.setPen(self._WHITE)
+        painter.drawText(badge_rect, Qt.AlignCenter, badge_text)
+
+        # Pulsanti
+        painter.setFont(self._button_font)
+        for action, button_rect in self._button_rects(rect):
+            background, pressed_background, border = self._BUTTON_COLORS[action]
+            pressed = self._pressed == (index.row(), action)
+            painter.setPen(QPen(border, 2))
+            painter.setBrush(pressed_background if pressed else background)
+            painter.drawEllipse(button_rect.adjusted(1, 1, -1, -1))
+            if action == 'xml':
+                self.xml_icon.paint(painter, button_rect.adjusted(8, 8, -8, -8))
             else:
-                subprocess.run(['xdg-open', folder])
-        except Exception as e:
-            QMessageBox.warning(self, t("ui.error"), t("card_details_ui.cannot_open_folder", error=str(e)))
+                painter.setPen(self._WHITE)
+                painter.drawText(button_rect, Qt.AlignCenter, self._BUTTON_TEXT[action])
+
+        painter.restore()
+
+    def _action_at(self, rect, pos):
+        for action, button_rect in self._button_rects(rect):
+            if button_rect.contains(pos):
+                return action
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            action = self._action_at(option.rect, event.pos())
+            if action is not None:
+                self._pressed = (index.row(), action)
+                return True
+        elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pressed, self._pressed = self._pressed, None
+            action = self._action_at(option.rect, event.pos())
+            if pressed is not None and pressed == (index.row(), action):
+                owner = index.data(Qt.UserRole)
+                if action == 'xml':
+                    self.xml_export_requested.emit(owner)
+                else:
+                    self.quantity_change_requested.emit(owner[0], -1 if action == 'minus' else 1)
+                return True
+            if pressed is not None:
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        """Tooltip dei pulsanti (come i vecchi setToolTip)."""
+        if event.type() == QEvent.ToolTip:
+            tips = {
+                'minus': "Rimuovi una copia",
+                'plus': "Aggiungi una copia",
+                'xml': "Esporta credenziali XML",
+            }
+            action = self._action_at(option.rect, event.pos())
+            if action is not None:
+                QToolTip.showText(event.globalPos(), tips[action], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
 
 class CollectionCardDialog(QDialog):
     """
@@ -510,12 +1274,48 @@ class CollectionCardDialog(QDialog):
     di una carta della collezione.
     Layout: [Dettagli a Sinistra] | [Immagine a Destra]
     """
+    
+    _xml_icon: Optional[QIcon] = None  # Icona del pulsante XML (creata al primo uso)
+    
+    # Cover già scalate (cover_path -> QPixmap): poche voci (una per set),
+    # a differenza del QPixmapCache non vengono mai espulse
+    _cover_cache: Dict[str, QPixmap] = {}
+    
+    # Stylesheet dell'elenco proprietari (le righe sono disegnate da OwnerDelegate)
+    _SCROLL_QSS = """
+        QListView {
+            border: none;
+            background-color: transparent;
+        }
+        QScrollBar:vertical {
+            border: none;
+            background: #2A2A2A;
+            width: 10px;
+            border-radius: 5px;
+        }
+        QScrollBar::handle:vertical {
+            background: #555;
+            border-radius: 5px;
+            min-height: 20px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background: #666;
+        }
+    """
+    
     def __init__(self, card_id: int, db_manager, parent=None):
         super().__init__(parent)
         
         self.card_id = card_id
         self.db_manager = db_manager
         
+        # Scritture quantità in attesa {account_id: quantità}, salvate in blocco
+        self._pending_writes = {}
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(150)
+        self._write_timer.timeout.connect(self._flush_writes)
+        
         # 1. Recupera i dati completi della carta
         self.card_data = self.fetch_card_data()
         if not self.card_data:
@@ -527,14 +1327,19 @@ class CollectionCardDialog(QDialog):
         self.setMinimumSize(600, 450)
 
         # 3. Layout principale (Orizzontale)
-        main_layout = QHBoxLayout(self)
+        self._main_layout = main_layout = QHBoxLayout(self)
         
         # 4. Crea e aggiungi i pannelli
         details_panel = self.create_details_panel()
-        image_panel = self.create_image_panel()
+        
+        # L'immagine (decodifica + scala del BLOB) arriva al giro successivo
+        # dell'event loop: i dettagli compaiono subito, intanto un segnaposto
+        self._image_placeholder = QWidget()
         
         main_layout.addWidget(details_panel, 2) # 2/3 dello spazio (priorità alla tabella)
-        main_layout.addWidget(image_panel, 1)   # 1/3 dello spazio (l'immagine si adatterà)
+        main_layout.addWidget(self._image_placeholder, 1)   # 1/3 dello spazio (l'immagine si adatterà)
+        
+        QTimer.singleShot(0, self._populate_image_panel)
 
 
 # Aggiungi questi due metodi a CollectionCardDialog
@@ -542,30 +1347,59 @@ class CollectionCardDialog(QDialog):
     def _handle_quantity_change(self, row_index: int, account_id: int, amount_change: int):
         """Gestisce il click sui pulsanti + e -."""
         try:
-            # 1. Leggi il valore ATTUALE dalla tabella
-            qty_item = self.owner_table.item(row_index, 1)
-            current_qty = int(qty_item.text())
+            # 1. Leggi il valore ATTUALE dal modello
+            current_qty = self.owners_model.quantity(row_index)
             new_qty = current_qty + amount_change
             
-            # 2. Aggiorna il Database
-            success = self.db_manager.set_inventory_quantity(account_id, self.card_id, new_qty)
-            
-            if not success:
-                QMessageBox.warning(self, "Errore", "Impossibile aggiornare il database.")
-                return
+            # 2. Accoda la scrittura: i click ravvicinati (anche su account
+            #    diversi) finiscono in un'unica transazione dopo 150ms
+            self._pending_writes[account_id] = new_qty
+            self._write_timer.start()
 
             # 3. Aggiorna la UI
             if new_qty <= 0:
-                # Rimuovi la riga dalla tabella
-                self.owner_table.removeRow(row_index)
+                # Rimuovi la riga dall'elenco e riallinea l'indice account -> riga
+                self.owners_model.remove_owner(row_index)
+                del self._owner_index[account_id]
+                for a_id, idx in self._owner_index.items():
+                    if idx > row_index:
+                        self._owner_index[a_id] = idx - 1
             else:
-                # Aggiorna il numero nella tabella
-                qty_item.setText(str(new_qty))
+                # Aggiorna il numero nella riga
+                self.owners_model.set_quantity(row_index, new_qty)
+            
+            # Totale copie aggiornato dalla differenza (card_data è già allineato, nessuna query)
+            self._total_copies += max(new_qty, 0) - current_qty
+            self._update_copies_badge()
                 
         except Exception as e:
             print(f"❌ Errore _handle_quantity_change: {e}")
             QMessageBox.warning(self, "Errore", f"Errore: {e}")
 
+    def _update_copies_badge(self):
+        """Testo del badge "N copie" accanto a "Posseduto da:"."""
+        total = self._total_copies
+        self._copies_badge.setText(f"{total} {'copia' if total == 1 else 'copie'}")
+
+    def _flush_writes(self):
+        """Scrive nel DB le quantità accodate da _handle_quantity_change."""
+        if not self._pending_writes:
+            return
+        pending, self._pending_writes = self._pending_writes, {}
+        if not self.db_manager.set_inventory_quantities(self.card_id, pending):
+            QMessageBox.warning(self, "Errore", "Impossibile aggiornare il database.")
+
+    def done(self, result):
+        """Alla chiusura scrive subito le modifiche ancora in attesa."""
+        self._write_timer.stop()
+        self._flush_writes()
+        super().done(result)
+
+    def _on_xml_export_requested(self, owner):
+        """Click sul pulsante XML di una riga proprietario."""
+        account_id, account_name, quantity, device_account, device_password = owner
+        self._handle_xml_export(device_account, device_password, account_name)
+
     def _handle_xml_export(self, device_account: str, device_password: str, account_name: str):
         """Genera il file XML e chiede all'utente dove salvarlo."""
         
@@ -604,44 +1438,35 @@ class CollectionCardDialog(QDialog):
         E la copertina del set.
         """
         try:
-            # Query 1: Dettagli della Carta (con BLOB e COPERTINA SET)
-            query_details = """
-                SELECT 
-                    c.card_name, s.set_name, c.set_code, 
-                    c.card_number, c.rarity, c.thumbnail_blob,
-                    s.cover_image_path 
-                FROM cards c
-                JOIN sets s ON c.set_code = s.set_code
-                WHERE c.id = ?
-            """
-            self.db_manager.cursor.execute(query_details, (self.card_id,))
-            result = self.db_manager.cursor.fetchone()
+            # Una sola query: dettagli carta (con COPERTINA SET) + proprietari;
+            # il BLOB dell'immagine è letto a parte da _read_card_blob.
+            # Il filtro sulla quantità sta nella ON, così una carta senza
+            # proprietari restituisce comunque la sua riga (con colonne NULL);
+            # i proprietari arrivano dall'indice parziale idx_ai_card_qty.
+            self.db_manager.cursor.execute(_Q_COLLECTION_CARD, (self.card_id,))
+            rows = self.db_manager.cursor.fetchall()
             
-            if not result:
+            if not rows:
                 return None
             
+            result = rows[0]
             card_data = {
                 'card_name': result[0],
                 'set_name': result[1],
                 'set_code': result[2],
                 'card_number': result[3],
                 'rarity': result[4],
-                'thumbnail_blob': result[5],
-                'cover_image_path': result[6] # <-- Aggiunto
+                'cover_image_path': result[5], # <-- Aggiunto
+                # Totale copie calcolato da SQLite (SUM ... OVER (), uguale su ogni riga)
+                'total_copies': result[-1]
             }
             
-            # Query 2: Elenco Proprietari
-            query_owners = """
-                SELECT 
-                    a.account_id, a.account_name, ai.quantity,
-                    a.device_account, a.device_password
-                FROM account_inventory ai
-                JOIN accounts a ON ai.account_id = a.account_id
-                WHERE ai.card_id = ? AND ai.quantity > 0
-                ORDER BY ai.quantity DESC, a.account_name ASC
-            """
-            self.db_manager.cursor.execute(query_owners, (self.card_id,))
-            owners = self.db_manager.cursor.fetchall()
+            # Proprietari: [account_id, account_name, quantity, device_account, device_password]
+            # (liste, non tuple: +/- aggiornano la quantità sul posto)
+            owners = [list(row[6:11]) for row in rows if row[6] is not None]
+            
+            # account_id -> indice della riga (lookup O(1) ai click su +/-)
+            self._owner_index = {owner[0]: i for i, owner in enumerate(owners)}
             
             card_data['owners'] = owners
             
@@ -661,9 +1486,13 @@ class CollectionCardDialog(QDialog):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
 
-        # --- Dettagli Carta ---
-        title_label = QLabel(self.card_data['card_name'])
-        title_label.setStyleSheet("font-size: 20px; font-weight: bold; color: #E0E0E0;")
+        # --- Dettagli Carta (nome e numero in un'unica label rich text) ---
+        title_label = QLabel(
+            f"<div style='font-size: 20px; font-weight: bold;'>{html.escape(self.card_data['card_name'])}</div>"
+            f"<div style='font-size: 14px; margin-top: 6px;'>Numero: #{html.escape(str(self.card_data['card_number']))}</div>"
+        )
+        title_label.setTextFormat(Qt.RichText)
+        title_label.setStyleSheet("color: #E0E0E0;")
         title_label.setWordWrap(True)
         layout.addWidget(title_label)
 
@@ -673,58 +1502,50 @@ class CollectionCardDialog(QDialog):
         set_cover_label = QLabel()
         set_cover_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         cover_path = self.card_data.get('cover_image_path')
-        
-        pixmap = QPixmap()
-        image_loaded = False
-        
+
+        # Cover già scaricata e scalata da un dialog precedente?
+        cover_pixmap = None
         if cover_path:
-            try:
-                if cover_path.startswith('http'):
-                    # È un URL, scarichiamolo
-                    headers = {'User-Agent': 'Mozilla/5.0'}
-                    req = urllib.request.Request(cover_path, headers=headers)
-                    with urllib.request.urlopen(req, timeout=3) as response: # Timeout 3 sec
-                        image_data = response.read()
-                    pixmap.loadFromData(image_data)
-                    image_loaded = not pixmap.isNull()
-                
-                elif os.path.exists(cover_path):
-                    # È un percorso locale (fallback)
-                    pixmap.load(cover_path)
-                    image_loaded = not pixmap.isNull()
+            cover_pixmap = CollectionCardDialog._cover_cache.get(cover_path)
+            if cover_pixmap is None:
+                cover_pixmap = QPixmapCache.find(_cover_key(cover_path))
 
-            except Exception as e:
-                print(f"⚠️ Impossibile caricare la cover del set: {e}")
-                image_loaded = False
-        
-        if image_loaded:
-            set_cover_label.setPixmap(pixmap.scaledToHeight(40, Qt.SmoothTransformation))
+        if cover_path and cover_pixmap is None:
+            if cover_path.startswith('http'):
+                # È un URL: download asincrono, intanto resta il testo di fallback
+                request = QNetworkRequest(QUrl(cover_path))
+                request.setRawHeader(b'User-Agent', b'Mozilla/5.0')
+                request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+                request.setTransferTimeout(3000)  # Timeout 3 sec
+                reply = _get_network_manager().get(request)
+                reply.finished.connect(
+                    lambda r=reply, lbl=set_cover_label, path=cover_path: self._on_cover_loaded(r, lbl, path)
+                )
+
+            else:
+                # È un percorso locale (fallback): QPixmap è nulla se il file manca
+                cover_pixmap = self._cache_cover(cover_path, cover_path)
+
+        if cover_pixmap is not None:
+            set_cover_label.setPixmap(cover_pixmap)
             set_cover_label.setToolTip(self.card_data['set_name'])
         else:
-            # Fallback al testo se la cover fallisce
+            # Fallback al testo se la cover fallisce (o è ancora in download)
             set_cover_label.setText(f"{self.card_data['set_name']} ({self.card_data['set_code']})")
             set_cover_label.setStyleSheet("font-size: 14px; color: #AAAAAA;")
-        
-        layout.addWidget(set_cover_label)
 
-        # --- Numero e Rarità ---
-        number_label = QLabel(f"Numero: #{self.card_data['card_number']}")
-        number_label.setStyleSheet("font-size: 14px; color: #E0E0E0;")
-        layout.addWidget(number_label)
+        layout.addWidget(set_cover_label)
 
+        # --- Rarità ---
         rarity = self.card_data.get('rarity', 'NA')
         rarity_icon_label = QLabel()
         rarity_icon_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         rarity_icon_label.setFixedHeight(25) 
         
-        if rarity in RARITY_DATA:
-            icon_full_path = get_resource_path(RARITY_DATA[rarity])
-            if os.path.exists(icon_full_path):
-                pixmap = QPixmap(icon_full_path)
-                rarity_icon_label.setPixmap(pixmap.scaledToHeight(25, Qt.SmoothTransformation))
-                rarity_icon_label.setToolTip(rarity)
-            else:
-                rarity_icon_label.setText(rarity)
+        rarity_pixmap = _get_rarity_pixmap(rarity)
+        if rarity_pixmap is not None:
+            rarity_icon_label.setPixmap(rarity_pixmap)
+            rarity_icon_label.setToolTip(rarity)
         else:
             rarity_icon_label.setText(rarity)
         
@@ -739,7 +1560,7 @@ class CollectionCardDialog(QDialog):
 
         # --- Titolo "Posseduto da:" con contatore ---
         owners = self.card_data.get('owners', [])
-        total_copies = sum(owner[2] for owner in owners) if owners else 0
+        self._total_copies = self.card_data['total_copies']
         
         owner_header = QWidget()
         owner_header_layout = QHBoxLayout(owner_header)
@@ -750,7 +1571,8 @@ class CollectionCardDialog(QDialog):
         owner_header_layout.addWidget(owner_title)
         
         if owners:
-            copies_badge = QLabel(f"{total_copies} {'copia' if total_copies == 1 else 'copie'}")
+            self._copies_badge = copies_badge = QLabel()
+            self._update_copies_badge()
             copies_badge.setStyleSheet("""
                 background-color: #2E5A44;
                 color: #FFFFFF;
@@ -782,189 +1604,88 @@ class CollectionCardDialog(QDialog):
             
             layout.addWidget(not_owned_container)
         else:
-            # Contenitore con scroll per gli account
-            scroll_area = QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_area.setFrameShape(QFrame.NoFrame)
-            scroll_area.setStyleSheet("""
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QScrollBar:vertical {
-                    border: none;
-                    background: #2A2A2A;
-                    width: 10px;
-                    border-radius: 5px;
-                }
-                QScrollBar::handle:vertical {
-                    background: #555;
-                    border-radius: 5px;
-                    min-height: 20px;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background: #666;
-                }
-            """)
-            
-            scroll_content = QWidget()
-            scroll_layout = QVBoxLayout(scroll_content)
-            scroll_layout.setContentsMargins(0, 0, 0, 0)
-            scroll_layout.setSpacing(8)
+            # Elenco account: un QListView, le righe sono disegnate da OwnerDelegate
+            # (già ordinati per quantità discendente dall'ORDER BY di fetch_card_data)
+            self.owners_model = OwnersModel(owners, self)
+            owner_delegate = OwnerDelegate(self._get_xml_icon(), self)
+            owner_delegate.quantity_change_requested.connect(self._handle_quantity_change_by_id)
+            owner_delegate.xml_export_requested.connect(self._on_xml_export_requested)
             
-            # Ordina gli account per quantità (discendente)
-            sorted_owners = sorted(owners, key=lambda x: x[2], reverse=True)
-            
-            for owner_data in sorted_owners:
-                (account_id, account_name, quantity, 
-                 device_account, device_password) = owner_data
-                
-                # Card per ogni account
-                account_card = QWidget()
-                account_card.setStyleSheet("""
-                    QWidget {
-                        background-color: #2A2A2A;
-                        border: 1px solid #3A3A3A;
-                        border-radius: 8px;
-                        padding: 10px;
-                    }
-                    QWidget:hover {
-                        border: 1px solid #4A4A4A;
-                        background-color: #2F2F2F;
-                    }
-                """)
-                
-                card_layout = QHBoxLayout(account_card)
-                card_layout.setContentsMargins(10, 8, 10, 8)
-                card_layout.setSpacing(10)
-                
-                # Info account (nome + badge quantità)
-                info_layout = QVBoxLayout()
-                info_layout.setSpacing(4)
-                
-                name_label = QLabel(account_name)
-                name_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #E0E0E0;")
-                info_layout.addWidget(name_label)
-                
-                qty_container = QWidget()
-                qty_layout = QHBoxLayout(qty_container)
-                qty_layout.setContentsMargins(0, 0, 0, 0)
-                qty_layout.setSpacing(5)
-                
-                qty_badge = QLabel(f"🃏 {quantity}")
-                qty_badge.setStyleSheet("""
-                    background-color: #314C6B;
-                    color: #FFFFFF;
-                    padding: 2px 8px;
-                    border-radius: 8px;
-                    font-size: 12px;
-                    font-weight: bold;
-                """)
-                qty_layout.addWidget(qty_badge)
-                qty_layout.addStretch()
-                
-                info_layout.addWidget(qty_container)
-                card_layout.addLayout(info_layout, 1)
-                
-                # Pulsanti azioni (layout verticale compatto)
-                actions_layout = QHBoxLayout()
-                actions_layout.setSpacing(6)
-                
-                # Bottone Rimuovi
-                minus_btn = QPushButton("−")
-                minus_btn.setFixedSize(36, 36)
-                minus_btn.setStyleSheet("""
-                    QPushButton {
-                        font-size: 20px;
-                        font-weight: bold;
-                        background-color: #5A3A3A;
-                        border: 2px solid #8B4444;
-                        border-radius: 18px;
-                        color: #FFFFFF;
-                    }
-                    QPushButton:hover {
-                        background-color: #6B4545;
-                        border: 2px solid #A55555;
-                    }
-                    QPushButton:pressed {
-                        background-color: #4A2A2A;
-                    }
-                """)
-                minus_btn.setToolTip("Rimuovi una copia")
-                minus_btn.clicked.connect(lambda _, a_id=account_id: self._handle_quantity_change_by_id(a_id, -1))
-                
-                # Bottone Aggiungi
-                plus_btn = QPushButton("+")
-                plus_btn.setFixedSize(36, 36)
-                plus_btn.setStyleSheet("""
-                    QPushButton {
-                        font-size: 20px;
-                        font-weight: bold;
-                        background-color: #2E5A44;
-                        border: 2px solid #449966;
-                        border-radius: 18px;
-                        color: #FFFFFF;
-                    }
-                    QPushButton:hover {
-                        background-color: #3A6B52;
-                        border: 2px solid #55AA77;
-                    }
-                    QPushButton:pressed {
-                        background-color: #244A34;
-                    }
-                """)
-                plus_btn.setToolTip("Aggiungi una copia")
-                plus_btn.clicked.connect(lambda _, a_id=account_id: self._handle_quantity_change_by_id(a_id, +1))
-                
-                # Bottone XML
-    # Bottone XML (Invariato)
-                xml_btn = QPushButton()
-                xml_btn.setFixedSize(36, 36) 
-                xml_icon = self.style().standardIcon(QStyle.SP_DialogSaveButton) 
-                xml_btn.setIcon(xml_icon)
-                xml_btn.setIconSize(QSize(20, 20))
-                xml_btn.setStyleSheet("""
-                        QPushButton {
-                            font-size: 16px;
-                            background-color: #314C6B;
-                            border: 2px solid #4477AA;
-                            border-radius: 18px;
-                            color: #FFFFFF;
-                        }
-                        QPushButton:hover {
-                            background-color: #3A5A7B;
-                            border: 2px solid #5588BB;
-                        }
-                        QPushButton:pressed {
-                            background-color: #243A5A;
-                        }
-                    """)
-                xml_btn.setToolTip("Esporta credenziali XML")
-                xml_btn.clicked.connect(lambda _, da=device_account, dp=device_password, an=account_name: 
-                                        self._handle_xml_export(da, dp, an))                
-                actions_layout.addWidget(minus_btn)
-                actions_layout.addWidget(plus_btn)
-                actions_layout.addWidget(xml_btn)
-                
-                card_layout.addLayout(actions_layout)
-                
-                scroll_layout.addWidget(account_card)
-            
-            scroll_layout.addStretch()
-            scroll_area.setWidget(scroll_content)
-            layout.addWidget(scroll_area)
+            owners_view = QListView()
+            owners_view.setModel(self.owners_model)
+            owners_view.setItemDelegate(owner_delegate)
+            owners_view.setUniformItemSizes(True)
+            owners_view.setSpacing(4)
+            owners_view.setSelectionMode(QAbstractItemView.NoSelection)
+            owners_view.setFocusPolicy(Qt.NoFocus)
+            owners_view.setMouseTracking(True)  # hover della riga
+            owners_view.setFrameShape(QFrame.NoFrame)
+            owners_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            owners_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+            owners_view.setStyleSheet(self._SCROLL_QSS)
+            layout.addWidget(owners_view)
         
         layout.addStretch()
         return panel
 
+    def _get_xml_icon(self):
+        """Icona standard del pulsante XML, condivisa da tutti i dialog."""
+        if CollectionCardDialog._xml_icon is None:
+            CollectionCardDialog._xml_icon = self.style().standardIcon(QStyle.SP_DialogSaveButton)
+        return CollectionCardDialog._xml_icon
+
+    @staticmethod
+    def _cache_cover(cover_path, source, image_format=b''):
+        """
+        Decodifica la cover già a 40px di altezza e la salva nel QPixmapCache:
+        le aperture successive non scaricano, non decodificano e non riscalano.
+        source è un percorso o un QIODevice (es. la QNetworkReply).
+        Restituisce None se l'immagine non è valida.
+        """
+        reader = QImageReader(source, image_format)
+        size = reader.size()
+        if size.isValid() and size.height() > 0:
+            # Decodifica direttamente alla dimensione finale (niente full-res + scaledToHeight)
+            reader.setScaledSize(QSize(max(1, round(size.width() * 40 / size.height())), 40))
+        image = reader.read()
+        if image.isNull():
+            return None
+        if not size.isValid():
+            # Formato senza dimensioni nell'header: scala dopo la decodifica
+            image = image.scaledToHeight(40, Qt.SmoothTransformation)
+        cover_pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(_cover_key(cover_path), cover_pixmap)
+        CollectionCardDialog._cover_cache[cover_path] = cover_pixmap
+        return cover_pixmap
+
+    def _on_cover_loaded(self, reply, label, cover_path):
+        """Slot del download asincrono della cover del set."""
+        try:
+            if reply.error() != QNetworkReply.NoError:
+                print(f"⚠️ Impossibile caricare la cover del set: {reply.errorString()}")
+                return
+
+            # Formato dal Content-Type (es. image/png -> png): QImageReader
+            # non deve indovinarlo dai primi byte; legge direttamente dalla reply
+            content_type = reply.header(QNetworkRequest.ContentTypeHeader) or ''
+            image_format = content_type.split(';')[0].strip().partition('image/')[2].encode()
+            if image_format not in _supported_image_formats():
+                image_format = b''
+            cover_pixmap = self._cache_cover(cover_path, reply, image_format)
+
+            # Il dialog può essere stato chiuso prima della fine del download
+            if cover_pixmap is not None and not sip.isdeleted(label):
+                label.setStyleSheet("")
+                label.setPixmap(cover_pixmap)
+                label.setToolTip(self.card_data['set_name'])
+        finally:
+            reply.deleteLater()
+
     def _handle_quantity_change_by_id(self, account_id: int, delta: int):
         """Gestisce il cambio di quantità dato l'account_id."""
-        # Trova l'indice nella lista owners
-        owners = self.card_data.get('owners', [])
-        for idx, owner_data in enumerate(owners):
-            if owner_data[0] == account_id:
-                self._handle_quantity_change(idx, account_id, delta)
-                break
+        idx = self._owner_index.get(account_id)
+        if idx is not None:
+            self._handle_quantity_change(idx, account_id, delta)
 
 
 #    def create_details_panel(self) -> QWidget:
@@ -1133,6 +1854,50 @@ class CollectionCardDialog(QDialog):
 #        layout.addStretch()
 #        return panel
 
+    def _read_card_blob(self):
+        """
+        Legge il BLOB dell'immagine della carta solo quando serve (fuori dalla
+        query dei dettagli, che lo ripeterebbe per ogni proprietario).
+        Con Python 3.11+ usa sqlite3.Blob sul rowid (cards.id). None se assente.
+        """
+        conn = self.db_manager.conn
+        try:
+            if hasattr(conn, 'blobopen'):
+                try:
+                    with conn.blobopen('cards', 'thumbnail_blob', self.card_id, readonly=True) as blob:
+                        return blob.read() or None
+                except sqlite3.OperationalError:
+                    # BLOB NULL (o colonna di altro tipo): nessuna immagine
+                    return None
+            self.db_manager.cursor.execute("SELECT thumbnail_blob FROM cards WHERE id = ?", (self.card_id,))
+            row = self.db_manager.cursor.fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"❌ Errore lettura immagine carta: {e}")
+            return None
+
+    @staticmethod
+    def _on_detail_image_ready(card_id, label, image):
+        """Slot del caricamento nel pool: mette in cache e mostra l'immagine (se il dialog è ancora aperto)."""
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            QPixmapCache.insert(_detail_key(card_id), pixmap)
+        if sip.isdeleted(label):
+            return
+        if pixmap.isNull():
+            label.setText("Immagine corrotta (BLOB)")
+        else:
+            label.setPixmap(pixmap)
+
+    def _populate_image_panel(self):
+        """Sostituisce il segnaposto con il pannello dell'immagine (stessa stretch 1/3)."""
+        placeholder = self._image_placeholder
+        if placeholder is None or sip.isdeleted(placeholder):
+            return
+        self._image_placeholder = None
+        self._main_layout.replaceWidget(placeholder, self.create_image_panel())
+        placeholder.deleteLater()
+
     def create_image_panel(self) -> QWidget:
         """Crea il pannello di destra con l'immagine della carta."""
         panel = QWidget()
@@ -1142,23 +1907,26 @@ class CollectionCardDialog(QDialog):
         image_label = QLabel()
         image_label.setAlignment(Qt.AlignCenter)
         
+        # Carta già aperta: immagine già decodificata e scalata nel QPixmapCache
+        # (il BLOB non viene nemmeno letto)
+        key = _detail_key(self.card_id)
+        cached = QPixmapCache.find(key)
+        
         # ✅ FIX: Carica dal BLOB
-        image_blob = self.card_data.get('thumbnail_blob')
+        image_blob = self._read_card_blob() if cached is None else None
         
-        if image_blob:
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_blob) # <-- Carica dati dal BLOB
-            
-            if not pixmap.isNull():
-                # Scala l'immagine
-                image_label.setPixmap(pixmap.scaled(
-                    350, 500, # Dimensioni massime
-                    Qt.KeepAspectRatio, 
-                    Qt.SmoothTransformation
-                ))
-            else:
-                image_label.setText("Immagine corrotta (BLOB)")
-                image_label.setStyleSheet("font-size: 16px; color: #888;")
+        if cached is not None:
+            image_label.setPixmap(cached)
+        elif image_blob:
+            # Decodifica e scala (smooth, 350x500 max) nel pool di thread:
+            # nel frattempo un testo di attesa, il thread GUI resta libero
+            image_label.setText("⏳ " + t("card_details.loading_image"))
+            image_label.setStyleSheet("font-size: 16px; color: #888;")
+            loader = _ImageLoader(image_blob, 350, 500)  # Dimensioni massime
+            loader.signals.ready.connect(
+                lambda img, lbl=image_label, card_id=self.card_id: self._on_detail_image_ready(card_id, lbl, img)
+            )
+            QThreadPool.globalInstance().start(loader)
 
         else:
             # Fallback se il BLOB è nullo
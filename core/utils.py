@@ -1,192 +1,90 @@
 """utils.py - Utility functions generiche"""
 
 # Import standard library
-import os
-import sys
-from typing import Optional, Any
+import threading
+from functools import lru_cache
 
 # Import PyQt5
-from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette, QColor
 
 # Import configurazione
-from config import ICON_PATH, get_resource_path
+from config import DARK_QSS_PATH
 
 
-def apply_dark_theme(app):
-    """Applica il tema scuro all'applicazione."""
-    app.setStyle("Fusion")
-    
-    darkpalette = QPalette()
-    darkpalette.setColor(QPalette.Window, QColor(53, 53, 53))
-    darkpalette.setColor(QPalette.WindowText, Qt.white)
-    darkpalette.setColor(QPalette.Base, QColor(35, 35, 35))
-    darkpalette.setColor(QPalette.AlternateBase, QColor(53, 53, 53))
-    darkpalette.setColor(QPalette.ToolTipBase, QColor(25, 25, 25))
-    darkpalette.setColor(QPalette.ToolTipText, Qt.white)
-    darkpalette.setColor(QPalette.Text, Qt.white)
-    darkpalette.setColor(QPalette.Button, QColor(53, 53, 53))
-    darkpalette.setColor(QPalette.ButtonText, Qt.white)
-    darkpalette.setColor(QPalette.BrightText, Qt.red)
+@lru_cache(maxsize=1)
+def _load_dark_qss() -> str:
+    """Legge lo stylesheet del tema scuro (gui/dark.qss) una sola volta."""
+    try:
+        with open(DARK_QSS_PATH, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError as e:
+        print(f"❌ Errore caricamento stylesheet: {e}")
+        return ""
+
+
+# Colori del tema scuro: (gruppo, ruolo, colore), creati una sola volta all'import
+_GOLD = QColor(243, 156, 18)  # #f39c12 - Giallo oro
+_COLORS = (
+    (QPalette.All, QPalette.Window, QColor(53, 53, 53)),
+    (QPalette.All, QPalette.WindowText, Qt.white),
+    (QPalette.All, QPalette.Base, QColor(35, 35, 35)),
+    (QPalette.All, QPalette.AlternateBase, QColor(53, 53, 53)),
+    (QPalette.All, QPalette.ToolTipBase, QColor(25, 25, 25)),
+    (QPalette.All, QPalette.ToolTipText, Qt.white),
+    (QPalette.All, QPalette.Text, Qt.white),
+    (QPalette.All, QPalette.Button, QColor(53, 53, 53)),
+    (QPalette.All, QPalette.ButtonText, Qt.white),
+    (QPalette.All, QPalette.BrightText, Qt.red),
     
     # ⬇️ CAMBIA QUESTI DA BLU A GIALLO ⬇️
-    darkpalette.setColor(QPalette.Link, QColor(243, 156, 18))  # #f39c12 - Giallo oro
-    darkpalette.setColor(QPalette.Highlight, QColor(243, 156, 18))  # #f39c12 - Giallo oro
-    darkpalette.setColor(QPalette.HighlightedText, Qt.black)
+    (QPalette.All, QPalette.Link, _GOLD),
+    (QPalette.All, QPalette.Highlight, _GOLD),
+    (QPalette.All, QPalette.HighlightedText, Qt.black),
     
-    darkpalette.setColor(QPalette.Disabled, QPalette.Text, Qt.darkGray)
-    darkpalette.setColor(QPalette.Disabled, QPalette.ButtonText, Qt.darkGray)
+    (QPalette.Disabled, QPalette.Text, Qt.darkGray),
+    (QPalette.Disabled, QPalette.ButtonText, Qt.darkGray),
+)
+
+
+@lru_cache(maxsize=1)
+def _build_dark_palette() -> QPalette:
+    """Costruisce la palette del tema scuro una sola volta (da _COLORS)."""
+    darkpalette = QPalette()
+    for group, role, color in _COLORS:
+        darkpalette.setColor(group, role, color)
+    return darkpalette
+
+
+def apply_dark_theme(app):
+    """Applica il tema scuro all'applicazione (una sola volta per QApplication)."""
+    # Già applicato: niente nuova istanza di stile né nuovo parsing del QSS
+    if app.property("dark_theme_applied"):
+        return
     
-    app.setPalette(darkpalette)
+    # Stile prima della palette: setStyle reimposta la palette standard dello stile
+    app.setStyle("Fusion")
+    app.setPalette(_build_dark_palette())
     
-    # Additional stylesheet
-    app.setStyleSheet("""
-        QToolTip { 
-            color: #ffffff; 
-            background-color: #2a82da; 
-            border: 1px solid white; 
-        }
-        QGroupBox {
-            border: 2px solid #555;
-            border-radius: 5px;
-            margin-top: 1ex;
-            padding: 15px;  /* ⬅️ Padding interno del box */
-            font-weight: bold;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            subcontrol-position: top left;
-            padding: 5px 10px;  /* ⬅️ Padding del titolo (verticale, orizzontale) */
-            color: #f39c12;
-        }
+    # Additional stylesheet (gui/dark.qss)
+    app.setStyleSheet(_load_dark_qss())
+    app.setProperty("dark_theme_applied", True)
+
+
+# Una sessione HTTP per thread: requests.Session non è garantita thread-safe
+# (cookie jar e adapter condivisi), ma ogni thread del pool riusa le proprie
+# connessioni keep-alive tra un download e l'altro
+_http_local = threading.local()
+
 
-        QTabWidget::pane {
-            border: 1px solid #444;
-            border-radius: 3px;
-        }
-        QTabBar::tab {
-            background: #353535;
-            border: 1px solid #444;
-            padding: 8px 16px;
-            margin-right: 2px;
-        }
-        QTabBar::tab:selected {
-            background: #2a82da;
-            color: white;
-        }
-        QTabBar::tab:hover {
-            background: #454545;
-        }
-        QPushButton {
-            border: 1px solid #555;
-            border-radius: 3px;
-            padding: 5px 15px;
-            background-color: #454545;
-        }
-        QPushButton:hover {
-            background-color: #555;
-        }
-        QPushButton:pressed {
-            background-color: #353535;
-        }
-        QPushButton:disabled {
-            background-color: #2a2a2a;
-            color: #666;
-        }
-        QLineEdit {
-            border: 1px solid #555;
-            border-radius: 3px;
-            padding: 5px;
-            background-color: #2a2a2a;
-        }
-        QLineEdit:focus {
-            border: 1px solid #2a82da;
-        }
-        QTextEdit {
-            border: 1px solid #555;
-            border-radius: 3px;
-            background-color: #2a2a2a;
-        }
-        QTableWidget {
-            border: 1px solid #555;
-            gridline-color: #555;
-            background-color: #2a2a2a;
-        }
-        QTableWidget::item:selected {
-            background-color: #2a82da;
-        }
-        QHeaderView::section {
-            background-color: #454545;
-            padding: 5px;
-            border: 1px solid #555;
-            font-weight: bold;
-        }
-        QProgressBar {
-            border: 1px solid #555;
-            border-radius: 3px;
-            text-align: center;
-            background-color: #2a2a2a;
-        }
-        QProgressBar::chunk {
-            background-color: #f39c12;
-            border-radius: 2px;
-        }
-        QCheckBox {
-            spacing: 5px;
-        }
-        QCheckBox::indicator {
-            width: 18px;
-            height: 18px;
-        }
-        QCheckBox::indicator:unchecked {
-            border: 1px solid #555;
-            background-color: #2a2a2a;
-            border-radius: 3px;
-        }
-        QCheckBox::indicator:checked {
-            border: 1px solid #2a82da;
-            background-color: #2a82da;
-            border-radius: 3px;
-        }
-        QSpinBox {
-            border: 1px solid #555;
-            border-radius: 3px;
-            padding: 3px;
-            background-color: #2a2a2a;
-        }
-        QScrollBar:vertical {
-            border: none;
-            background: #2a2a2a;
-            width: 14px;
-            margin: 0;
-        }
-        QScrollBar::handle:vertical {
-            background: #555;
-            min-height: 20px;
-            border-radius: 7px;
-        }
-        QScrollBar::handle:vertical:hover {
-            background: #666;
-        }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-            height: 0px;
-        }
-        QScrollBar:horizontal {
-            border: none;
-            background: #2a2a2a;
-            height: 14px;
-            margin: 0;
-        }
-        QScrollBar::handle:horizontal {
-            background: #555;
-            min-width: 20px;
-            border-radius: 7px;
-        }
-        QScrollBar::handle:horizontal:hover {
-            background: #666;
-        }
-        QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-            width: 0px;
-        }
-    """)
+def get_http_session():
+    """Restituisce la requests.Session del thread corrente (creata al primo uso)."""
+    session = getattr(_http_local, 'session', None)
+    if session is None:
+        import requests
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        _http_local.session = session
+    return session
@@ -3,6 +3,10 @@
 Gestisce lo stato e la logica della Wishlist.
 """
 
+from typing import Dict, Iterable, Set
+
+from PyQt5.QtCore import QTimer
+
 from .database import DatabaseManager
 
 class WishlistManager:
@@ -11,14 +15,28 @@ class WishlistManager:
     continue al database.
     """
     
-    def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
-        self.wishlist_set = set() # Un set per controlli 'in' super veloci
+    # Niente __dict__ per istanza: attributi in slot a offset fisso
+    # (__weakref__ serve a PyQt per collegare il timer al metodo flush)
+    __slots__ = ('db', 'wishlist_set', '_pending', '_flush_timer', '__weakref__')
+    
+    def __init__(self, db_manager: DatabaseManager) -> None:
+        self.db: DatabaseManager = db_manager
+        self.wishlist_set: Set[int] = set() # Un set per controlli 'in' super veloci
+        
+        # Toggle non ancora salvati {card_id: nuovo stato}: scritti in blocco
+        # (una sola transazione) 250 ms dopo l'ultimo click
+        self._pending: Dict[int, bool] = {}
+        self._flush_timer: QTimer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(250)
+        self._flush_timer.timeout.connect(self.flush)
 
-    def load_wishlist(self):
+    def load_wishlist(self) -> None:
         """
         (Ri)Carica l'intera wishlist dal database alla cache interna (self.wishlist_set).
+        I toggle ancora in attesa vengono salvati prima, altrimenti andrebbero persi.
         """
+        self.flush()
         print("Sincronizzazione Wishlist...")
         self.wishlist_set = self.db.get_wishlist()
         print(f"✅ Wishlist caricata: {len(self.wishlist_set)} carte.")
@@ -26,21 +44,47 @@ class WishlistManager:
     def is_wished(self, card_id: int) -> bool:
         """
         Controlla se una carta è nella wishlist (usa la cache interna).
+        Wishlist vuota (caso comune): nessun hash/lookup nel set.
+        """
+        wishlist = self.wishlist_set
+        return bool(wishlist) and card_id in wishlist
+
+    def wished_among(self, card_ids: Iterable[int]) -> Set[int]:
+        """
+        Restituisce le carte di card_ids presenti nella wishlist.
+        Un solo controllo per una pagina/set di carte: l'intersezione gira
+        in C invece di N chiamate a is_wished.
         """
-        return card_id in self.wishlist_set
+        return self.wishlist_set.intersection(card_ids)
 
     def toggle_wishlist(self, card_id: int) -> bool:
         """
-        Esegue il toggle nel database e aggiorna la cache interna.
+        Aggiorna la cache interna (autorevole per la UI) e accoda la modifica
+        per il database, salvata da flush() insieme agli altri toggle.
         Restituisce il *nuovo* stato (True se è in wishlist, False altrimenti).
         """
-        # 1. Esegui la modifica sul DB
-        new_state_is_wished = self.db.toggle_wishlist_status(card_id)
+        card_id = int(card_id)
+        new_state_is_wished = card_id not in self.wishlist_set
         
-        # 2. Aggiorna la cache interna
+        # 1. Aggiorna la cache interna
         if new_state_is_wished:
             self.wishlist_set.add(card_id)
         else:
             self.wishlist_set.discard(card_id) # 'discard' non dà errore se non c'è
+        
+        # 2. Accoda la modifica (un doppio toggle lascia solo lo stato finale)
+        self._pending[card_id] = new_state_is_wished
+        self._flush_timer.start()
             
-        return new_state_is_wished
\ No newline at end of file
+        return new_state_is_wished
+
+    def flush(self) -> None:
+        """Salva nel database i toggle in attesa, in un'unica transazione."""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        
+        pending, self._pending = self._pending, {}
+        if not self.db.set_wishlist_states(pending):
+            # Scrittura fallita: riallinea la cache allo stato reale del DB
+            self.load_wishlist()
\ No newline at end of file
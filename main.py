@@ -1,14 +1,24 @@
 """main.py - Entry point principale dell'applicazione"""
 import sys
 from PyQt5.QtWidgets import QApplication
-from core.ui_main_window import MainWindow
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmapCache
 from core.utils import apply_dark_theme
 
 
 def main():
     """Entry point principale"""
+    # Da impostare prima di creare la QApplication. Niente AA_EnableHighDpiScaling:
+    # con l'arrotondamento di default di Qt 5.15 uno schermo al 150% passerebbe
+    # a 2x e le miniature delle carte (devicePixelRatio 1.0) verrebbero
+    # ingrandite a ogni paint. Le icone usano comunque le varianti @2x se presenti
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     app = QApplication(sys.argv)
+    QPixmapCache.setCacheLimit(256 * 1024)  # 256 MB per le miniature delle carte
     apply_dark_theme(app)
+    
+    # Import dell'intera UI solo dopo QApplication e tema
+    from core.ui_main_window import MainWindow
     window = MainWindow()
     window.show()
     sys.exit(app.exec_())
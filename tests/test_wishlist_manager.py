@@ -0,0 +1,63 @@
+# tests/test_wishlist_manager.py
+"""
+Test della cache wishlist con salvataggio differito (WishlistManager).
+"""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication
+
+from core.database import DatabaseManager
+from core.wishlist_manager import WishlistManager
+
+
+class WishlistManagerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        self.db.connect()
+        self.db.setup_database()
+        self.manager = WishlistManager(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def db_wishlist(self):
+        self.db.cursor.execute("SELECT card_id FROM wishlist ORDER BY card_id")
+        return [row[0] for row in self.db.cursor.fetchall()]
+
+    def test_reload_keeps_pending_toggles(self):
+        # Toggle e ricarica subito, prima che scatti il timer di flush
+        self.assertTrue(self.manager.toggle_wishlist(1))
+        self.assertTrue(self.manager.toggle_wishlist(2))
+        self.assertFalse(self.manager.toggle_wishlist(2))
+        self.manager.load_wishlist()
+
+        self.assertEqual(self.manager.wishlist_set, {1})
+        self.assertTrue(self.manager.is_wished(1))
+        self.assertFalse(self.manager.is_wished(2))
+        self.assertEqual(self.db_wishlist(), [1])
+
+    def test_reload_keeps_pending_removal(self):
+        self.manager.toggle_wishlist(5)
+        self.manager.flush()
+        self.assertEqual(self.db_wishlist(), [5])
+
+        self.assertFalse(self.manager.toggle_wishlist(5))
+        self.manager.load_wishlist()
+
+        self.assertEqual(self.manager.wishlist_set, set())
+        self.assertEqual(self.db_wishlist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()